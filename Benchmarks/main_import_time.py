@@ -0,0 +1,34 @@
+import subprocess
+import sys
+
+IMPORT_SCRIPT = """
+import sys
+import time
+start = time.perf_counter()
+import resources.options
+elapsed = time.perf_counter() - start
+print(elapsed, 'matplotlib' in sys.modules, 'scipy' in sys.modules)
+"""
+
+
+def cold_import_time(module_script=IMPORT_SCRIPT, repeats=5):
+    # every measurement runs in a fresh interpreter so nothing is cached in sys.modules
+    results = list()
+    for i in range(repeats):
+        output = subprocess.run(
+            [sys.executable, '-c', module_script], capture_output=True, text=True, check=True
+        ).stdout.split()
+        results.append((float(output[-3]), output[-2] == 'True', output[-1] == 'True'))
+    return min(results)
+
+
+def test_1(budget=0.25):
+    elapsed, loaded_matplotlib, loaded_scipy = cold_import_time()
+    print("Cold import of resources.options: %.1f ms" % (elapsed * 1000))
+    assert not loaded_matplotlib, "resources.options must not import matplotlib"
+    assert not loaded_scipy, "resources.options must not import scipy"
+    assert elapsed < budget, "Cold import took %.1f ms, budget is %.1f ms" % (elapsed * 1000, budget * 1000)
+
+
+if __name__ == '__main__':
+    test_1()
@@ -1,5 +1,6 @@
 from resources.PortfolioHandler import PortfolioHandler
 from resources.SharpeRatioOptimizer import SharpeRatioOptimizer
+from resources.EfficientFrontier import EfficientFrontier
 
 
 def portfolio_example():
@@ -22,6 +23,11 @@ def portfolio_example():
     sharpe_ratio_optimizer.print_kpis()
     sharpe_ratio_optimizer.show_portfolios_with_sharpe_ratio()
 
+    efficient_frontier = EfficientFrontier(portfolio_handler.daily_returns, stocks)
+    efficient_frontier.calculate_frontier(50)
+    efficient_frontier.print_kpis()
+    efficient_frontier.show_frontier()
+
 
 if __name__ == '__main__':
     portfolio_example()
\ No newline at end of file
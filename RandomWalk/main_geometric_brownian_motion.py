@@ -1,11 +1,11 @@
 import matplotlib.pyplot as plt
 import numpy as np
 
-def simulate_geometric_random_walk(S0, T=2, N=1000, mu=0.1, sigma=0.05):
+def simulate_geometric_random_walk(S0, T=2, N=1000, mu=0.1, sigma=0.05, seed=None):
     dt = T/N
     t = np.linspace(0, T, N)
-    # standard normal distribution N(0,1)
-    W = np.random.standard_normal(size=N)
+    # standard normal distribution N(0,1), from an independent stream for reproducibility
+    W = np.random.default_rng(seed).standard_normal(size=N)
     # N(0,dt) = sqrt(dt) * N(0,1)
     W = np.cumsum(W) * np.sqrt(dt)
     X = (mu - 0.5 * sigma ** 2) * t * sigma * W
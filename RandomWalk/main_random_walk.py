@@ -2,7 +2,7 @@ import numpy.random as npr
 import numpy as np
 import matplotlib.pyplot as plt
 
-def wiener_process(dt=0.1, x0=0, n=1000):
+def wiener_process(dt=0.1, x0=0, n=1000, seed=None):
     # W(t=0) = 0
     W = np.zeros(n+1)
 
@@ -12,7 +12,7 @@ def wiener_process(dt=0.1, x0=0, n=1000):
     # we have to use cumulative sum: on every step the additional value is drawn
     # from a normal distribution with mean 0 and varinace dt ... N(0,dt)
     # btw: N(0, dt) = sqrt(dt) + N(0,1) -> this formula is usually used
-    W[1:n+1] = np.cumsum(np.random.normal(0, np.sqrt(dt), n))
+    W[1:n+1] = np.cumsum(np.random.default_rng(seed).normal(0, np.sqrt(dt), n))
 
     return t, W
 
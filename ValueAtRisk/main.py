@@ -13,7 +13,7 @@ class ValueAtRisk:
 
     def initialize(self):
         self._stock_data_handler.initialize_data()
-        self._log_daily_return = MathHandler.calculate_log_daily_return(self._stock_data_handler.stock_data)
+        self._log_daily_return = MathHandler.calculate_log_daily_return(self._stock_data_handler.price_panel)
 
     @property
     def log_daily_return(self):
@@ -1,5 +1,8 @@
 import numpy as np
-from scipy import stats
+
+from resources.specialfunctions import norm_cdf
+from resources.ParallelMonteCarlo import ParallelMonteCarlo
+from resources.Samplers import PseudoRandomSampler
 
 class BlackScholesBase:
 	def __init__(self, S0, E, T, rf, sigma):
@@ -29,50 +32,186 @@ class BlackScholesAnalytical(BlackScholesBase):
 
 	def call_option_price(self):
 		# use the N(x) to calculate the price of the option
-		return self._S0 * stats.norm.cdf(self._d1) - self._E * np.exp(-self._rf * self._T) * stats.norm.cdf(self._d2)
+		return self._S0 * norm_cdf(self._d1) - self._E * np.exp(-self._rf * self._T) * norm_cdf(self._d2)
 
 	def put_option_price(self):
 		# use the N(x) to calculate the price of the option
-		return -self._S0 * stats.norm.cdf(-self._d1) + self._E * np.exp(-self._rf * self._T) * stats.norm.cdf(-self._d2)
+		return -self._S0 * norm_cdf(-self._d1) + self._E * np.exp(-self._rf * self._T) * norm_cdf(-self._d2)
 
 
 class BlackScholesMonteCarlo(BlackScholesBase):
-	def __init__(self, S0, E, T, rf, sigma, iterations):
+	VARIANCE_REDUCTIONS = ('antithetic', 'control_analytical', 'control_underlying', 'moment_matching')
+
+	def __init__(self, S0, E, T, rf, sigma, iterations, variance_reduction=None, sampler=None):
 		super().__init__(S0, E, T, rf, sigma)
 		self._iterations = iterations
+		# a Sampler from resources.Samplers, the global np.random state is used if None
+		self._sampler = sampler
 		self._stock_price = None
+		self._standard_error = None
+		# any combination of VARIANCE_REDUCTIONS, given as a single name or a collection
+		if variance_reduction is None:
+			variance_reduction = ()
+		elif isinstance(variance_reduction, str):
+			variance_reduction = (variance_reduction,)
+		unknown = set(variance_reduction) - set(BlackScholesMonteCarlo.VARIANCE_REDUCTIONS)
+		if unknown:
+			raise ValueError("Unknown variance reduction: {}".format(", ".join(sorted(unknown))))
+		self._variance_reduction = frozenset(variance_reduction)
+
+	@property
+	def standard_error(self):
+		# standard error of the last price from calculate_option, calculate_option_streaming
+		# or calculate_option_parallel
+		return self._standard_error
 
 	def calculate_stock_prices(self):
 		# dimensions: 1 dimensional array with as many items as the itrations
-		rand = np.random.normal(0, 1, [1, self._iterations])
-
-		# equation for the S(t) stock price
-		self._stock_price = self._S0 * np.exp(
-			self._T * (self._rf - 0.5 * self._sigma ** 2) + self._sigma * np.sqrt(self._T) * rand
-		)
+		rand = self._draw_normals(self._iterations)
+		self._stock_price = self._terminal_stock_price(rand)
 
 	def calculate_option(self, option_type='call'):
-		option_data = self._option_value(option_type)
+		samples = self._payoff(self._stock_price, option_type).ravel()
+		controls, control_means = self._control_variates(self._stock_price.ravel(), option_type)
+
+		if 'antithetic' in self._variance_reduction:
+			# the second half of the paths mirrors the first one, the pair averages
+			# are the independent samples
+			half = samples.size // 2
+			samples = 0.5 * (samples[:half] + samples[half:])
+			controls = 0.5 * (controls[:, :half] + controls[:, half:])
+
+		if controls.shape[0] > 0:
+			# regress the payoff on the controls and remove the part explained by the
+			# deviation of the controls from their known expectations
+			deviations = controls - control_means[:, None]
+			beta = np.linalg.lstsq(
+				(deviations - deviations.mean(axis=1, keepdims=True)).T, samples - samples.mean(), rcond=None
+			)[0]
+			samples = samples - beta @ deviations
+
+		discount = np.exp(-1.0 * self._rf * self._T)
+		self._standard_error = discount * np.std(samples, ddof=1) / np.sqrt(samples.size)
 		# average for the Monte-Carlo method
-		# np.amax() returns the max(0,S-E) according to the formula
-		average = np.sum(np.amax(option_data, axis=1)) / float(self._iterations)
 		# have to use the exp(-rT) discount factor
-		return np.exp(-1.0 * self._rf * self._T) * average
+		return discount * np.mean(samples)
+
+	def calculate_option_streaming(self, option_type='call', chunk_size=100000):
+		# paths are drawn chunk by chunk and only the count, mean and co-moment matrix of
+		# the payoff and its controls are kept, so memory does not grow with the
+		# iterations; antithetic pairs and moment matching are applied within each chunk
+		drawn, count, mean, m2 = 0, 0, 0.0, 0.0
+		while drawn < self._iterations:
+			size = min(chunk_size, self._iterations - drawn)
+			drawn += size
+			chunk_count, chunk_mean, chunk_m2, control_means = self._chunk_moments(size, option_type)
+			count, mean, m2 = BlackScholesMonteCarlo._merge_moments(count, mean, m2, chunk_count, chunk_mean, chunk_m2)
+		return self._estimate_from_moments(count, mean, m2, control_means)
+
+	def calculate_option_parallel(self, option_type='call', seed=None, workers=None, block_size=100000):
+		# blocks of paths are simulated in worker processes with independent streams spawned
+		# from the seed, and the partial moments are merged in block order
+		if self._sampler is not None:
+			raise ValueError("calculate_option_parallel draws its own streams from the seed, the model must not have a sampler")
+		blocks = ParallelMonteCarlo(workers, block_size).map_blocks(
+			_payoff_moments_block, self._iterations, seed,
+			(self._S0, self._E, self._T, self._rf, self._sigma), tuple(sorted(self._variance_reduction)), option_type
+		)
+		count, mean, m2 = 0, 0.0, 0.0
+		for block_count, block_mean, block_m2, control_means in blocks:
+			count, mean, m2 = BlackScholesMonteCarlo._merge_moments(count, mean, m2, block_count, block_mean, block_m2)
+		return self._estimate_from_moments(count, mean, m2, control_means)
 
 	def print_option_price_values(self):
 		print("Call option price with Monte-Carlo approach: ", self.calculate_option('call'))
 		print("Put option price with Monte-Carlo approach: ", self.calculate_option('put'))
 
-	def _option_value(self, option_type='call'):
-		# we have 2 columns: first with 0s the second column will store the payoff
-		# we need the first column of 0s: payoff function is max(0,S-E) for call option
-		option_data = np.zeros([self._iterations, 2])
-
-		# we need S-E because we have to calculate the max(S-E,0)
-		option_data[:,1] = self._stock_price - self._E
+	def _standard_normals(self, size):
+		if self._sampler is None:
+			return np.random.normal(0, 1, size)
+		return self._sampler.normals(size, 1).ravel()
+
+	def _draw_normals(self, size):
+		if 'antithetic' in self._variance_reduction:
+			half = self._standard_normals((size + 1) // 2).reshape(1, -1)
+			rand = np.concatenate([half, -half], axis=1)
+		else:
+			rand = self._standard_normals(size).reshape(1, -1)
+		if 'moment_matching' in self._variance_reduction:
+			# force the sample mean and variance to the exact moments of N(0,1)
+			rand = (rand - rand.mean()) / rand.std()
+		return rand
+
+	def _control_variates(self, stock_price, option_type='call'):
+		# undiscounted control samples together with their known expectations
+		controls = list()
+		control_means = list()
+		if 'control_underlying' in self._variance_reduction:
+			controls.append(stock_price)
+			control_means.append(self._S0 * np.exp(self._rf * self._T))
+		if 'control_analytical' in self._variance_reduction:
+			# the opposite option type, priced exactly by the analytical model
+			analytical = BlackScholesAnalytical(self._S0, self._E, self._T, self._rf, self._sigma)
+			analytical.calculate_d1_d2()
+			if option_type == 'put':
+				controls.append(self._payoff(stock_price, 'call'))
+				control_means.append(analytical.call_option_price() * np.exp(self._rf * self._T))
+			else:
+				controls.append(self._payoff(stock_price, 'put'))
+				control_means.append(analytical.put_option_price() * np.exp(self._rf * self._T))
+		return np.array(controls).reshape(len(controls), stock_price.size), np.array(control_means)
+
+	def _chunk_moments(self, size, option_type='call'):
+		# draws size paths and returns the count, mean and co-moment matrix of the payoff
+		# stacked on its controls, together with the known expectations of the controls
+		stock_price = self._terminal_stock_price(self._draw_normals(size)).ravel()
+		controls, control_means = self._control_variates(stock_price, option_type)
+		samples = np.vstack([self._payoff(stock_price, option_type)[None, :], controls])
+		if 'antithetic' in self._variance_reduction:
+			half = samples.shape[1] // 2
+			samples = 0.5 * (samples[:, :half] + samples[:, half:])
+		mean = samples.mean(axis=1)
+		centered = samples - mean[:, None]
+		return samples.shape[1], mean, centered @ centered.T, control_means
+
+	def _estimate_from_moments(self, count, mean, m2, control_means):
+		# discounted price from merged moments, its standard error is stored like in
+		# calculate_option, the control variates regression is solved on the co-moment matrix
+		price, m2_price = mean[0], m2[0, 0]
+		if mean.size > 1:
+			beta = np.linalg.lstsq(m2[1:, 1:], m2[1:, 0], rcond=None)[0]
+			price = price - beta @ (mean[1:] - control_means)
+			m2_price = m2_price - beta @ m2[1:, 0]
+		discount = np.exp(-1.0 * self._rf * self._T)
+		standard_error = np.sqrt(max(m2_price, 0.0) / (count - 1) / count) if count > 1 else np.nan
+		self._standard_error = discount * standard_error
+		return discount * price
+
+	def _terminal_stock_price(self, rand):
+		# equation for the S(t) stock price
+		return self._S0 * np.exp(
+			self._T * (self._rf - 0.5 * self._sigma ** 2) + self._sigma * np.sqrt(self._T) * rand
+		)
 
+	def _payoff(self, stock_price, option_type='call'):
+		# payoff function is max(0,S-E) for call option and max(0,E-S) for put option
 		if option_type == 'put':
-			# we need E-S because we have to calculate the max(E-S,0)
-			option_data[:, 1] = self._E - self._stock_price
-
-		return option_data
+			return np.maximum(self._E - stock_price, 0.0)
+		return np.maximum(stock_price - self._E, 0.0)
+
+	@staticmethod
+	def _merge_moments(count_a, mean_a, m2_a, count_b, mean_b, m2_b):
+		# Chan et al. parallel update of the count, mean vector and co-moment matrix
+		count = count_a + count_b
+		delta = mean_b - mean_a
+		mean = mean_a + delta * count_b / count
+		m2 = m2_a + m2_b + np.outer(delta, delta) * count_a * count_b / count
+		return count, mean, m2
+
+
+def _payoff_moments_block(model_parameters, variance_reduction, option_type, size, seed_sequence):
+	# runs in a worker process, returns the moments of BlackScholesMonteCarlo._chunk_moments
+	model = BlackScholesMonteCarlo(
+		*model_parameters, size, variance_reduction=variance_reduction, sampler=PseudoRandomSampler(seed_sequence)
+	)
+	return model._chunk_moments(size, option_type)
@@ -0,0 +1,75 @@
+import numpy as np
+
+from resources.MathHandler import MathHandler, PortfolioMoments, FactorPortfolioMoments
+from resources.RunningMoments import ExponentialMoments
+
+
+def _returns_array(log_daily_return):
+    # [T, N] float array of the days where every asset has a return
+    returns = np.asarray(log_daily_return, dtype=np.float64)
+    return returns[np.isfinite(returns).all(axis=1)]
+
+
+class SampleCovariance:
+    # plain sample covariance, the default of MathHandler.portfolio_moments
+    def estimate(self, log_daily_return):
+        return PortfolioMoments.from_returns(_returns_array(log_daily_return))
+
+
+class LedoitWolfCovariance:
+    # Ledoit and Wolf (2004) shrinkage of the sample covariance S towards m I, m the
+    # average variance, with the optimal intensity delta:
+    #   C = delta m I + (1 - delta) S
+    # always well conditioned, even with more assets than days
+    def estimate(self, log_daily_return):
+        returns = _returns_array(log_daily_return)
+        num_of_days, num_of_assets = returns.shape
+        mean = returns.mean(axis=0)
+        centered = returns - mean
+        sample = centered.T @ centered / num_of_days
+
+        target = np.trace(sample) / num_of_assets
+        distance = np.sum(sample ** 2) - 2 * target * np.trace(sample) + target ** 2 * num_of_assets
+        # sum over the days of ||x x^T - S||^2 = sum of |x|^4 - T ||S||^2
+        squared_norms = np.sum(centered ** 2, axis=1)
+        spread = (np.sum(squared_norms ** 2) / num_of_days - np.sum(sample ** 2)) / num_of_days
+        shrinkage = min(spread, distance) / distance if distance > 0 else 1.0
+
+        covariance = (1 - shrinkage) * sample
+        covariance[np.diag_indices(num_of_assets)] += shrinkage * target
+        return PortfolioMoments(mean * MathHandler.NUM_TRADING_DAYS, covariance * MathHandler.NUM_TRADING_DAYS)
+
+
+class ExponentialCovariance:
+    # exponentially weighted mean and covariance (RiskMetrics, decay 0.94 for daily data)
+    def __init__(self, decay=0.94):
+        self._decay = decay
+
+    def estimate(self, log_daily_return):
+        returns = _returns_array(log_daily_return)
+        moments = ExponentialMoments(returns.shape[1], self._decay)
+        moments.update(returns)
+        return PortfolioMoments(
+            moments.mean * MathHandler.NUM_TRADING_DAYS, moments.covariance * MathHandler.NUM_TRADING_DAYS
+        )
+
+
+class FactorCovariance:
+    # Statistical factor model from the first num_of_factors principal components of the
+    # returns, C = B B^T + diag(d). The components come from the SVD of the [T, N]
+    # returns, so the N x N sample covariance is never formed.
+    def __init__(self, num_of_factors=5):
+        self._num_of_factors = num_of_factors
+
+    def estimate(self, log_daily_return):
+        returns = _returns_array(log_daily_return)
+        mean = returns.mean(axis=0)
+        centered = (returns - mean) / np.sqrt(returns.shape[0] - 1)
+        _, singular_values, components = np.linalg.svd(centered, full_matrices=False)
+        loadings = components[:self._num_of_factors].T * singular_values[:self._num_of_factors]
+        # the specific variance is what the factors leave of each asset's variance
+        specific_variance = np.clip(np.sum(centered ** 2, axis=0) - np.sum(loadings ** 2, axis=1), 0, None)
+        return FactorPortfolioMoments(
+            mean * MathHandler.NUM_TRADING_DAYS, loadings * np.sqrt(MathHandler.NUM_TRADING_DAYS),
+            specific_variance * MathHandler.NUM_TRADING_DAYS
+        )
@@ -26,6 +26,19 @@ class DataPlotter:
         )
         plt.show()
 
+    @staticmethod
+    def show_efficient_frontier(frontier_vols, frontier_rets, minimum_variance, maximum_sharpe):
+        # minimum_variance and maximum_sharpe are [return, volatility, Sharpe ratio]
+        plt.figure(figsize=(10, 6))
+        plt.plot(frontier_vols, frontier_rets, 'b-', label='Efficient frontier')
+        plt.plot(minimum_variance[1], minimum_variance[0], 'r*', markersize=20, label='Minimum variance')
+        plt.plot(maximum_sharpe[1], maximum_sharpe[0], 'g*', markersize=20, label='Maximum Sharpe ratio')
+        plt.grid(True)
+        plt.xlabel('Expected Volatility')
+        plt.ylabel('Expected Return')
+        plt.legend()
+        plt.show()
+
     @staticmethod
     def plot_capm_regression(m_returns, s_returns, alpha, beta):
         fig, axis = plt.subplots(1, figsize=(20, 10))
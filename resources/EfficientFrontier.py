@@ -0,0 +1,111 @@
+import numpy as np
+import scipy.optimize as optimization
+
+from resources.MathHandler import MathHandler
+from resources.SharpeRatioOptimizer import SharpeRatioOptimizer
+from resources.DataPlotter import DataPlotter
+
+
+class EfficientFrontier:
+    # Traces the long-only efficient frontier exactly instead of sampling random
+    # portfolios. Every frontier point is the minimum-variance portfolio for a target
+    # return, solved as a QP with SLSQP and analytic gradients, warm started from the
+    # solution of the previous target.
+    def __init__(self, log_daily_returns, stocks, covariance_estimator=None):
+        self._moments = MathHandler.portfolio_moments(log_daily_returns, covariance_estimator)
+        self._stocks = stocks
+        self._num_of_stocks = len(stocks)
+        self._minimum_variance = None
+        self._maximum_sharpe = None
+        self._frontier_weights = None
+        self._frontier_means = None
+        self._frontier_risks = None
+
+    @property
+    def minimum_variance_portfolio(self):
+        return self._minimum_variance
+
+    @property
+    def maximum_sharpe_portfolio(self):
+        return self._maximum_sharpe
+
+    @property
+    def frontier_weights(self):
+        return self._frontier_weights
+
+    @property
+    def frontier_means(self):
+        return self._frontier_means
+
+    @property
+    def frontier_risks(self):
+        return self._frontier_risks
+
+    def calculate_frontier(self, num_of_points=50):
+        # targets whose QP fails (e.g. numerically infeasible next to the best asset's
+        # return) are left out and do not become the warm start of the next target
+        x0 = np.full(self._num_of_stocks, 1 / self._num_of_stocks)
+        self._minimum_variance = EfficientFrontier._solution(
+            EfficientFrontier.minimize_variance(self._moments, x0), "minimum variance portfolio"
+        )
+        self._maximum_sharpe = EfficientFrontier._solution(
+            SharpeRatioOptimizer.optimize_portfolio([self._minimum_variance], self._moments, self._num_of_stocks),
+            "maximum Sharpe ratio portfolio"
+        )
+
+        # above the minimum-variance return up to the best single asset, the highest
+        # return a long-only portfolio can reach
+        target_returns = np.linspace(
+            MathHandler.portfolio_return(self._moments, self._minimum_variance),
+            np.max(self._moments.mean), num_of_points
+        )
+        frontier_weights = list()
+        weights = self._minimum_variance
+        for target_return in target_returns:
+            result = EfficientFrontier.minimize_variance(self._moments, weights, target_return)
+            if result.success:
+                weights = result.x
+                frontier_weights.append(weights)
+        self._frontier_weights = np.array(frontier_weights).reshape(-1, self._num_of_stocks)
+        self._frontier_means = MathHandler.portfolios_returns(self._moments, self._frontier_weights)
+        self._frontier_risks = MathHandler.portfolios_risks(self._moments, self._frontier_weights)
+
+    def print_kpis(self):
+        print("Stocks: ", self._stocks)
+        for name, weights in (
+                ("Minimum variance", self._minimum_variance), ("Maximum Sharpe ratio", self._maximum_sharpe)
+        ):
+            print(name, "portfolio: ", weights.round(3))
+            print("Expected return, risk and Sharpe ratio: ", SharpeRatioOptimizer.statistics(weights, self._moments))
+
+    def show_frontier(self):
+        DataPlotter.show_efficient_frontier(
+            self._frontier_risks, self._frontier_means,
+            SharpeRatioOptimizer.statistics(self._minimum_variance, self._moments),
+            SharpeRatioOptimizer.statistics(self._maximum_sharpe, self._moments)
+        )
+
+    @staticmethod
+    def minimize_variance(returns, x0, target_return=None):
+        # min w^T C w subject to sum(w) = 1, 0 <= w <= 1 and w^T mu = target_return
+        moments = MathHandler.portfolio_moments(returns)
+        constraints = [{
+            'type': 'eq', 'fun': lambda x: np.sum(x) - 1, 'jac': lambda x: np.ones_like(x)
+        }]
+        if target_return is not None:
+            constraints.append({
+                'type': 'eq', 'fun': lambda x: moments.mean @ x - target_return, 'jac': lambda x: moments.mean
+            })
+        bounds = tuple(
+            (0, 1) for i in range(len(x0))
+        )
+        return optimization.minimize(
+            fun=moments.variance, x0=x0, jac=lambda x: 2 * moments.covariance_product(x),
+            method='SLSQP', bounds=bounds, constraints=constraints
+        )
+
+    @staticmethod
+    def _solution(result, name):
+        if not result.success:
+            raise RuntimeError("Optimization of the {} failed: {}".format(name, result.message))
+        return result.x
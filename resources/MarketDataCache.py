@@ -0,0 +1,125 @@
+import importlib.util
+import json
+import os
+
+import pandas as pd
+
+from resources.MarketDataProvider import MarketDataProvider, YahooFinanceProvider
+
+
+class MarketDataCache:
+    # Persistent cache of daily market data. Every field of every ticker is stored in its
+    # own file, <directory>/<ticker>/<field>.parquet, and <ticker>/coverage.json records
+    # the date ranges already fetched, so only the missing ranges are requested from the
+    # provider. Pickle files are used when no Parquet engine is installed.
+    def __init__(self, directory, provider=None, file_format=None):
+        self._directory = directory
+        self._provider = provider if provider is not None else YahooFinanceProvider()
+        self._file_format = file_format if file_format is not None else MarketDataCache._default_file_format()
+
+    @property
+    def provider(self):
+        return self._provider
+
+    @staticmethod
+    def _default_file_format():
+        if importlib.util.find_spec('pyarrow') or importlib.util.find_spec('fastparquet'):
+            return 'parquet'
+        return 'pickle'
+
+    def get(self, ticker, field, start_date, end_date):
+        # returns the field of the ticker for [start_date, end_date), fetching the date
+        # ranges that are not cached yet
+        start_date, end_date = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        for missing_start, missing_end in self.missing_ranges(ticker, start_date, end_date):
+            self.store(ticker, self._provider.download(ticker, missing_start, missing_end), missing_start, missing_end)
+        series = self._load_field(ticker, field)
+        return series[(series.index >= start_date) & (series.index < end_date)].rename(ticker)
+
+    def get_many(self, tickers, field, start_date, end_date):
+        # like get for several tickers, the tickers missing the same date range are
+        # fetched together with one bulk provider request
+        start_date, end_date = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        requests = dict()
+        for ticker in tickers:
+            for missing_range in self.missing_ranges(ticker, start_date, end_date):
+                requests.setdefault(missing_range, list()).append(ticker)
+        for (missing_start, missing_end), missing_tickers in requests.items():
+            frames = self._provider.download_many(missing_tickers, missing_start, missing_end)
+            for ticker in missing_tickers:
+                self.store(ticker, frames[ticker], missing_start, missing_end)
+        return {ticker: self.get(ticker, field, start_date, end_date) for ticker in tickers}
+
+    def missing_ranges(self, ticker, start_date, end_date):
+        missing = list()
+        current, end_date = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        for covered_start, covered_end in self._load_coverage(ticker):
+            if covered_end <= current:
+                continue
+            if covered_start >= end_date:
+                break
+            if covered_start > current:
+                missing.append((current, covered_start))
+            current = max(current, covered_end)
+        if current < end_date:
+            missing.append((current, end_date))
+        return missing
+
+    def store(self, ticker, data, start_date, end_date):
+        # merges downloaded data for [start_date, end_date) into the cached files, ranges
+        # reaching into the future are only marked as covered up to today and an empty
+        # result for a range with business days is treated as a failed fetch, never as
+        # covered, so it is requested again next time
+        os.makedirs(os.path.join(self._directory, ticker), exist_ok=True)
+        for field in data.columns:
+            series = data[field].dropna()
+            cached = self._load_field(ticker, field)
+            if not cached.empty:
+                cached = cached[(cached.index < start_date) | (cached.index >= end_date)]
+                series = pd.concat([cached, series]).sort_index()
+            self._write(series.to_frame(field), self._field_path(ticker, field))
+
+        end_date = min(pd.Timestamp(end_date), pd.Timestamp.today().normalize())
+        if data.empty and MarketDataProvider.has_business_days(start_date, end_date):
+            return
+        if start_date < end_date:
+            self._save_coverage(ticker, self._load_coverage(ticker) + [(pd.Timestamp(start_date), end_date)])
+
+    def _field_path(self, ticker, field):
+        extension = 'parquet' if self._file_format == 'parquet' else 'pkl'
+        return os.path.join(self._directory, ticker, '{}.{}'.format(field.replace(' ', '_'), extension))
+
+    def _coverage_path(self, ticker):
+        return os.path.join(self._directory, ticker, 'coverage.json')
+
+    def _load_field(self, ticker, field):
+        path = self._field_path(ticker, field)
+        if not os.path.exists(path):
+            return pd.Series(dtype=float, index=pd.DatetimeIndex([]))
+        if self._file_format == 'parquet':
+            return pd.read_parquet(path).iloc[:, 0]
+        return pd.read_pickle(path).iloc[:, 0]
+
+    def _write(self, frame, path):
+        if self._file_format == 'parquet':
+            frame.to_parquet(path)
+        else:
+            frame.to_pickle(path)
+
+    def _load_coverage(self, ticker):
+        path = self._coverage_path(ticker)
+        if not os.path.exists(path):
+            return list()
+        with open(path) as file:
+            return [(pd.Timestamp(start), pd.Timestamp(end)) for start, end in json.load(file)]
+
+    def _save_coverage(self, ticker, ranges):
+        # merges overlapping and adjacent ranges before saving
+        merged = list()
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        with open(self._coverage_path(ticker), 'w') as file:
+            json.dump([(start.isoformat(), end.isoformat()) for start, end in merged], file)
@@ -0,0 +1,88 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+
+class MarketDataProvider:
+    # interface of the market data sources used by StockDataHandler and MarketDataCache,
+    # download returns a DataFrame indexed by date with one column per field
+    # ('Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume'), end_date is exclusive
+    def __init__(self, max_workers=8, max_retries=3, backoff=1.0):
+        self._max_workers = max_workers
+        self._max_retries = max_retries
+        self._backoff = backoff
+
+    def download(self, ticker, start_date, end_date):
+        raise NotImplementedError
+
+    def download_many(self, tickers, start_date, end_date):
+        # returns a dict of the per ticker frames, fetched through a bounded thread pool
+        tickers = list(tickers)
+        with ThreadPoolExecutor(max_workers=max(1, min(self._max_workers, len(tickers)))) as executor:
+            frames = executor.map(lambda ticker: self.download_with_retries(ticker, start_date, end_date), tickers)
+            return dict(zip(tickers, frames))
+
+    def download_with_retries(self, ticker, start_date, end_date):
+        # retries downloads that raise with exponential backoff, an empty result is a
+        # valid answer (weekends, holidays, tickers not listed yet) and returned as is
+        for attempt in range(self._max_retries + 1):
+            try:
+                return self.download(ticker, start_date, end_date)
+            except Exception:
+                if attempt == self._max_retries:
+                    raise
+            time.sleep(self._backoff * 2 ** attempt)
+
+    @staticmethod
+    def has_business_days(start_date, end_date):
+        return len(pd.bdate_range(start_date, end_date, inclusive='left')) > 0
+
+
+class YahooFinanceProvider(MarketDataProvider):
+    def download(self, ticker, start_date, end_date):
+        # imported here so that other providers work without yfinance installed
+        import yfinance as yf
+        data = yf.download(ticker, start_date, end_date, auto_adjust=False, progress=False)
+        if isinstance(data.columns, pd.MultiIndex):
+            # recent yfinance versions add the ticker as a second column level
+            data.columns = data.columns.get_level_values(0)
+        data = data.dropna(how='all')
+        # yfinance only logs failed downloads and returns an empty frame, raise instead so
+        # that download_with_retries retries them
+        error = getattr(yf.shared, '_ERRORS', dict()).get(ticker)
+        if error is not None or (data.empty and MarketDataProvider.has_business_days(start_date, end_date)):
+            raise IOError("Download of {} failed: {}".format(ticker, error or "no data returned"))
+        return data
+
+    def download_many(self, tickers, start_date, end_date):
+        # one request for all tickers, yfinance threads it internally, tickers that come
+        # back empty although the range has business days are fetched again alone, with
+        # retries as download raises on failures
+        import yfinance as yf
+        tickers = list(tickers)
+        data = yf.download(
+            tickers, start_date, end_date, group_by='ticker', threads=self._max_workers,
+            auto_adjust=False, progress=False
+        )
+        frames = dict()
+        for ticker in tickers:
+            frame = data[ticker].dropna(how='all') if ticker in data.columns.get_level_values(0) else pd.DataFrame()
+            if frame.empty and MarketDataProvider.has_business_days(start_date, end_date):
+                frame = self.download_with_retries(ticker, start_date, end_date)
+            frames[ticker] = frame
+        return frames
+
+
+class CsvDirectoryProvider(MarketDataProvider):
+    # local source reading <directory>/<ticker>.csv files with a Date column, used for
+    # tests and offline work
+    def __init__(self, directory, **kwargs):
+        super().__init__(**kwargs)
+        self._directory = directory
+
+    def download(self, ticker, start_date, end_date):
+        data = pd.read_csv(os.path.join(self._directory, ticker + '.csv'), index_col=0, parse_dates=True)
+        data = data.sort_index()
+        return data[(data.index >= pd.Timestamp(start_date)) & (data.index < pd.Timestamp(end_date))]
@@ -1,5 +1,83 @@
 import numpy as np
 
+from resources.PricePanel import PricePanel
+
+
+class PortfolioMoments:
+    # Annualized mean vector and covariance matrix of a returns dataset. Computed once,
+    # every portfolio evaluation against them is an O(N^2) quadratic form.
+    def __init__(self, mean, covariance):
+        self._mean = np.asarray(mean, dtype=np.float64)
+        self._covariance = np.asarray(covariance, dtype=np.float64)
+
+    @classmethod
+    def from_returns(cls, log_daily_return):
+        # DataFrames keep the pandas NaN handling (skipna mean, pairwise covariance)
+        if hasattr(log_daily_return, 'cov'):
+            mean = log_daily_return.mean().to_numpy()
+            covariance = log_daily_return.cov().to_numpy()
+        else:
+            log_daily_return = np.asarray(log_daily_return, dtype=np.float64)
+            mean = log_daily_return.mean(axis=0)
+            covariance = np.cov(log_daily_return, rowvar=False)
+        return cls(mean * MathHandler.NUM_TRADING_DAYS, covariance * MathHandler.NUM_TRADING_DAYS)
+
+    @property
+    def mean(self):
+        return self._mean
+
+    @property
+    def covariance(self):
+        return self._covariance
+
+    def covariance_product(self, weights):
+        # C w
+        return self._covariance @ weights
+
+    def variance(self, weights):
+        # w^T C w
+        return weights @ self._covariance @ weights
+
+    def variances(self, weights):
+        # w^T C w of every row of a [K, N] matrix of weights
+        return np.einsum('kn,kn->k', weights @ self._covariance, weights)
+
+
+class FactorPortfolioMoments(PortfolioMoments):
+    # Moments of a factor model, C = B B^T + diag(d) with [N, k] loadings B and specific
+    # variances d. The dense N x N matrix is only built if covariance is accessed, the
+    # portfolio evaluations cost O(N k).
+    def __init__(self, mean, loadings, specific_variance):
+        self._mean = np.asarray(mean, dtype=np.float64)
+        self._loadings = np.asarray(loadings, dtype=np.float64)
+        self._specific_variance = np.asarray(specific_variance, dtype=np.float64)
+        self._covariance = None
+
+    @property
+    def loadings(self):
+        return self._loadings
+
+    @property
+    def specific_variance(self):
+        return self._specific_variance
+
+    @property
+    def covariance(self):
+        if self._covariance is None:
+            self._covariance = self._loadings @ self._loadings.T + np.diag(self._specific_variance)
+        return self._covariance
+
+    def covariance_product(self, weights):
+        return self._loadings @ (self._loadings.T @ weights) + self._specific_variance * weights
+
+    def variance(self, weights):
+        factor_exposures = self._loadings.T @ weights
+        return factor_exposures @ factor_exposures + self._specific_variance @ (weights * weights)
+
+    def variances(self, weights):
+        factor_exposures = weights @ self._loadings
+        return np.einsum('kf,kf->k', factor_exposures, factor_exposures) + (weights * weights) @ self._specific_variance
+
 
 class MathHandler:
     NUM_TRADING_DAYS = 252
@@ -7,6 +85,9 @@ class MathHandler:
     @staticmethod
     def calculate_log_daily_return(data):
         # Log used because of normalization to measure all variables in comparable metric
+        # a PricePanel computes np.diff(np.log(prices)) once and shares it without copies
+        if isinstance(data, PricePanel):
+            return data.log_returns_frame()
         # [1:] exclude Nan
         return np.log(data/data.shift(1))[1:]
 
@@ -16,6 +97,16 @@ class MathHandler:
         w /= np.sum(w)
         return w
 
+    @staticmethod
+    def get_random_weights(num_of_portfolios, length, dirichlet_alpha=None):
+        # [num_of_portfolios, length] matrix of weights summing to one per row, drawn as
+        # get_random_weight row after row, or from a symmetric Dirichlet distribution
+        if dirichlet_alpha is not None:
+            return np.random.dirichlet(np.full(length, dirichlet_alpha), size=num_of_portfolios)
+        w = np.random.random((num_of_portfolios, length))
+        w /= np.sum(w, axis=1, keepdims=True)
+        return w
+
     @staticmethod
     def annual_expected_return(log_daily_return):
         return log_daily_return * MathHandler.NUM_TRADING_DAYS
@@ -28,22 +119,39 @@ class MathHandler:
         # high positive covariance does not provide much diversification
         return log_daily_return.cov() * MathHandler.NUM_TRADING_DAYS
 
+    @staticmethod
+    def portfolio_moments(log_daily_return, estimator=None):
+        # annualized mean and covariance of the returns, precomputed moments are passed
+        # through unchanged so callers evaluating many portfolios estimate them only once,
+        # an estimator from resources.CovarianceEstimators replaces the sample covariance
+        if isinstance(log_daily_return, PortfolioMoments):
+            return log_daily_return
+        if estimator is not None:
+            return estimator.estimate(log_daily_return)
+        return PortfolioMoments.from_returns(log_daily_return)
+
     @staticmethod
     def portfolio_return(log_daily_return, weights):
-        return np.sum(log_daily_return.mean()*weights)*MathHandler.NUM_TRADING_DAYS
+        # log_daily_return is the returns dataset or its precomputed PortfolioMoments
+        moments = MathHandler.portfolio_moments(log_daily_return)
+        return np.dot(moments.mean, weights)
 
     @staticmethod
     def portfolio_risks(log_daily_return, weights):
         # expected portfolio variance
         # portfolio volatility
         #sigma = sqrt(w^T*sigma_covariance_matrix*w)
-        return np.sqrt(
-            np.dot(
-                np.transpose(
-                    weights
-                ),
-                np.dot(
-                    log_daily_return.cov()*MathHandler.NUM_TRADING_DAYS, weights
-                )
-            )
-        )
\ No newline at end of file
+        # evaluated by the moments, in O(N k) for a factor model
+        moments = MathHandler.portfolio_moments(log_daily_return)
+        return np.sqrt(moments.variance(np.asarray(weights, dtype=np.float64)))
+
+    @staticmethod
+    def portfolios_returns(log_daily_return, weights):
+        # expected returns of a [K, N] matrix of portfolio weights
+        return weights @ MathHandler.portfolio_moments(log_daily_return).mean
+
+    @staticmethod
+    def portfolios_risks(log_daily_return, weights):
+        # volatilities of a [K, N] matrix of portfolio weights, the quadratic form of
+        # every row in one product
+        return np.sqrt(MathHandler.portfolio_moments(log_daily_return).variances(weights))
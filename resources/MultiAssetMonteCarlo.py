@@ -0,0 +1,70 @@
+import numpy as np
+
+from resources.MathHandler import MathHandler
+
+
+class MultiAssetMonteCarlo:
+    # Correlated geometric Brownian motion for a whole set of assets. mu is the vector of
+    # annual expected log returns and covariance the annual covariance of log returns,
+    # as computed from the log daily returns by MathHandler. The covariance is factorized
+    # once and every step of every path is correlated in one batched matrix product.
+    def __init__(self, S0, mu, covariance, N=252, NUM_OF_SIMULATIONS=1000, dt=None, sampler=None,
+                 dtype=np.float64):
+        self._S0 = np.asarray(S0, dtype=np.float64)
+        self._mu = np.asarray(mu, dtype=np.float64)
+        self._covariance = np.asarray(covariance, dtype=np.float64)
+        self._N = N
+        self._NUM_OF_SIMULATIONS = NUM_OF_SIMULATIONS
+        # one trading day per step by default
+        self._dt = dt if dt is not None else 1 / MathHandler.NUM_TRADING_DAYS
+        # a Sampler from resources.Samplers, the global np.random state is used if None
+        self._sampler = sampler
+        self._dtype = dtype
+        self._factor = MultiAssetMonteCarlo.factorize(self._covariance)
+
+    @classmethod
+    def from_portfolio(cls, portfolio_handler, N=252, NUM_OF_SIMULATIONS=1000, **kwargs):
+        return cls(
+            portfolio_handler.current_prices, portfolio_handler.annual_mean_returns,
+            portfolio_handler.annual_covariance, N, NUM_OF_SIMULATIONS, **kwargs
+        )
+
+    @property
+    def factor(self):
+        return self._factor
+
+    @staticmethod
+    def factorize(covariance):
+        # returns L with L L^T = covariance, through Cholesky when the matrix is positive
+        # definite and otherwise through the eigendecomposition with the negative
+        # eigenvalues (estimation noise) clipped to zero
+        try:
+            return np.linalg.cholesky(covariance)
+        except np.linalg.LinAlgError:
+            eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+            return eigenvectors * np.sqrt(np.clip(eigenvalues, 0, None))
+
+    def simulate_paths(self):
+        # [N + 1, NUM_OF_SIMULATIONS, number of assets] array of prices
+        num_of_assets = self._S0.size
+        if self._sampler is None:
+            normals = np.random.normal(size=(self._NUM_OF_SIMULATIONS, self._N * num_of_assets))
+        else:
+            normals = self._sampler.normals(self._NUM_OF_SIMULATIONS, self._N * num_of_assets)
+        normals = normals.astype(self._dtype, copy=False).reshape(self._NUM_OF_SIMULATIONS, self._N, num_of_assets)
+
+        paths = np.empty((self._N + 1, self._NUM_OF_SIMULATIONS, num_of_assets), dtype=self._dtype)
+        paths[0] = 0
+        # correlate all shocks at once: [..., assets] @ L^T
+        log_increments = np.matmul(normals, (np.sqrt(self._dt) * self._factor.T).astype(self._dtype))
+        log_increments += (self._mu * self._dt).astype(self._dtype)
+        np.cumsum(log_increments.transpose(1, 0, 2), axis=0, out=paths[1:])
+        np.exp(paths, out=paths)
+        paths *= self._S0.astype(self._dtype)
+        return paths
+
+    def simulate_portfolio_values(self, weights):
+        # [N + 1, NUM_OF_SIMULATIONS] value of a portfolio that holds the fraction
+        # weights[i] of one unit of money in asset i at t=0
+        units = np.asarray(weights, dtype=np.float64) / self._S0
+        return self.simulate_paths() @ units.astype(self._dtype)
@@ -0,0 +1,36 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+class ParallelMonteCarlo:
+    # Splits a simulation into fixed-size blocks of paths. Every block gets its own
+    # random stream spawned from one SeedSequence, and the partition only depends on the
+    # number of paths and the block size, so the merged result is bit-identical for a
+    # given seed whatever the number of workers.
+    def __init__(self, workers=None, block_size=100000):
+        self._workers = workers
+        self._block_size = block_size
+
+    def block_sizes(self, num_of_paths):
+        num_of_blocks = -(-num_of_paths // self._block_size)
+        sizes = [self._block_size] * num_of_blocks
+        sizes[-1] = num_of_paths - self._block_size * (num_of_blocks - 1)
+        return sizes
+
+    def map_blocks(self, function, num_of_paths, seed, *args, pass_offsets=False):
+        # calls function(*args, size, seed_sequence) for every block and returns the
+        # results in block order, with pass_offsets the index of the first path of the
+        # block is passed before the size
+        sizes = self.block_sizes(num_of_paths)
+        seed_sequences = np.random.SeedSequence(seed).spawn(len(sizes))
+        offsets = np.cumsum([0] + sizes[:-1]).tolist()
+        tasks = [
+            args + ((offset,) if pass_offsets else ()) + (size, seed_sequence)
+            for offset, size, seed_sequence in zip(offsets, sizes, seed_sequences)
+        ]
+
+        if self._workers == 1 or len(tasks) == 1:
+            return [function(*task) for task in tasks]
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+            return list(executor.map(function, *zip(*tasks)))
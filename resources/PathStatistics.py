@@ -0,0 +1,106 @@
+import numpy as np
+
+
+class PathStatistics:
+    # Per time step running statistics of simulated paths, updated batch by batch so the
+    # paths themselves never need to be stored. Mean and variance are merged with the
+    # Chan et al. parallel update, quantiles come from a merging t-digest whose centroids
+    # are vectorized over the time steps, so memory is O(N * compression).
+    def __init__(self, N, compression=200):
+        self._compression = compression
+        self._count = 0
+        self._mean = np.zeros(N)
+        self._m2 = np.zeros(N)
+        self._min = np.full(N, np.inf)
+        self._max = np.full(N, -np.inf)
+        self._centroid_means = np.zeros((N, 0))
+        self._centroid_weights = np.zeros((N, 0))
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def mean(self):
+        return self._mean
+
+    @property
+    def variance(self):
+        return self._m2 / (self._count - 1) if self._count > 1 else np.full_like(self._m2, np.nan)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    @property
+    def minimum(self):
+        return self._min
+
+    @property
+    def maximum(self):
+        return self._max
+
+    def update(self, paths):
+        # paths: [N, batch] array, one column per path
+        paths = np.asarray(paths, dtype=np.float64)
+        batch_count = paths.shape[1]
+        if batch_count == 0:
+            return
+        batch_mean = paths.mean(axis=1)
+        batch_m2 = np.sum((paths - batch_mean[:, None]) ** 2, axis=1)
+
+        count = self._count + batch_count
+        delta = batch_mean - self._mean
+        self._mean = self._mean + delta * batch_count / count
+        self._m2 = self._m2 + batch_m2 + delta ** 2 * self._count * batch_count / count
+        self._count = count
+
+        np.minimum(self._min, paths.min(axis=1), out=self._min)
+        np.maximum(self._max, paths.max(axis=1), out=self._max)
+        self._merge_digest(paths)
+
+    def quantile(self, q):
+        # interpolates between the centroid centres, with the exact minimum and maximum
+        # as the end points
+        result = np.empty(self._mean.size)
+        target = q * self._count
+        for i in range(self._mean.size):
+            weights = self._centroid_weights[i]
+            means = self._centroid_means[i][weights > 0]
+            weights = weights[weights > 0]
+            centres = np.cumsum(weights) - weights / 2
+            result[i] = np.interp(
+                target,
+                np.concatenate(([0.0], centres, [self._count])),
+                np.concatenate(([self._min[i]], means, [self._max[i]]))
+            )
+        return result
+
+    def _merge_digest(self, paths):
+        rows = self._mean.size
+        # the centroids are already sorted, so with a sorted batch the stable sort only
+        # has to merge two runs
+        means = np.concatenate((self._centroid_means, np.sort(paths, axis=1)), axis=1)
+        weights = np.concatenate((self._centroid_weights, np.ones(paths.shape)), axis=1)
+        order = np.argsort(means, axis=1, kind='stable')
+        means = np.take_along_axis(means, order, axis=1)
+        weights = np.take_along_axis(weights, order, axis=1)
+
+        # the k1 scale function gives narrow centroids in the tails and wide ones around
+        # the median, every element goes to the centroid of its quantile
+        cumulative = np.cumsum(weights, axis=1)
+        q = (cumulative - weights / 2) / cumulative[:, -1:]
+        k = np.floor(self._compression * (np.arcsin(2 * q - 1) / np.pi + 0.5)).astype(int)
+        k = np.clip(k, 0, self._compression - 1)
+
+        index = (np.arange(rows)[:, None] * self._compression + k).ravel()
+        size = rows * self._compression
+        new_weights = np.bincount(index, weights=weights.ravel(), minlength=size).reshape(rows, -1)
+        # empty centroids hold -inf, masked before multiplying by their zero weight
+        sums = np.where(weights > 0, means, 0.0) * weights
+        new_sums = np.bincount(index, weights=sums.ravel(), minlength=size).reshape(rows, -1)
+        self._centroid_weights = new_weights
+        # empty centroids take the mean of the previous one, which keeps every row sorted
+        self._centroid_means = np.maximum.accumulate(
+            np.divide(new_sums, new_weights, out=np.full_like(new_sums, -np.inf), where=new_weights > 0), axis=1
+        )
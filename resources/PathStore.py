@@ -0,0 +1,103 @@
+import ctypes
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class _SharedMemory(shared_memory.SharedMemory):
+    # close (also called on garbage collection) leaves the mapping to the last exported
+    # view instead of failing while views are still alive
+    def close(self):
+        try:
+            super().close()
+        except BufferError:
+            pass
+
+
+class PathStore:
+    # Array of simulated paths backed either by a multiprocessing.shared_memory block or
+    # by an np.memmap file. Other processes attach to the same buffer through the small
+    # picklable descriptor instead of receiving a pickled copy of the paths.
+    # Views of array (including the paths of a model that simulated into the store) keep
+    # the shared memory mapped: close releases the store's own reference and the name,
+    # the mapping itself is only removed once the last view is gone.
+    SHARED_MEMORY = 'shared_memory'
+    MEMMAP = 'memmap'
+
+    def __init__(self, backing, location, shape, dtype, create=True):
+        self._backing = backing
+        self._shape = tuple(shape)
+        self._dtype = np.dtype(dtype)
+        self._owner = create
+        self._shared_memory = None
+
+        if backing == PathStore.SHARED_MEMORY:
+            if create:
+                size = max(int(np.prod(self._shape)) * self._dtype.itemsize, 1)
+                self._shared_memory = _SharedMemory(name=location, create=True, size=size)
+            else:
+                self._shared_memory = _SharedMemory(name=location)
+            self._location = self._shared_memory.name
+            self._array = self._map_shared_memory()
+        elif backing == PathStore.MEMMAP:
+            self._location = location
+            self._array = np.memmap(location, dtype=self._dtype, mode='w+' if create else 'r+', shape=self._shape)
+        else:
+            raise ValueError("Unknown path store backing: {}".format(backing))
+
+    @classmethod
+    def create_shared(cls, shape, dtype=np.float64, name=None):
+        return cls(PathStore.SHARED_MEMORY, name, shape, dtype)
+
+    @classmethod
+    def create_memmap(cls, filename, shape, dtype=np.float64):
+        return cls(PathStore.MEMMAP, filename, shape, dtype)
+
+    @classmethod
+    def attach(cls, descriptor):
+        backing, location, shape, dtype = descriptor
+        return cls(backing, location, shape, dtype, create=False)
+
+    @property
+    def descriptor(self):
+        return self._backing, self._location, self._shape, self._dtype.str
+
+    @property
+    def array(self):
+        return self._array
+
+    @property
+    def shape(self):
+        return self._shape
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    def flush(self):
+        if self._backing == PathStore.MEMMAP:
+            self._array.flush()
+
+    def _map_shared_memory(self):
+        # numpy keeps no buffer export of the shared memory, so the array is built on a
+        # ctypes buffer that holds one, the mapping then cannot be closed under the views
+        size = int(np.prod(self._shape)) * self._dtype.itemsize
+        buffer = (ctypes.c_char * size).from_buffer(self._shared_memory.buf)
+        return np.ndarray(self._shape, dtype=self._dtype, buffer=buffer)
+
+    def close(self):
+        # releases this process' view, the creating process also unlinks the shared
+        # memory, the mapping is freed now or, if views are still alive, with the last one
+        self.flush()
+        self._array = None
+        if self._shared_memory is not None:
+            self._shared_memory.close()
+            if self._owner:
+                self._shared_memory.unlink()
+            self._shared_memory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
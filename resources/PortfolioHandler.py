@@ -1,49 +1,88 @@
+import numpy as np
+
 from resources.StockDataHandler import StockDataHandler
-from resources.MathHandler import MathHandler
+from resources.MathHandler import MathHandler, PortfolioMoments
 from resources.DataPlotter import DataPlotter
+from resources.RunningMoments import ExpandingMoments
 
 
 class PortfolioHandler:
-    def __init__(self, stocks, start_date, end_date, portfolio_weights):
+    def __init__(self, stocks, start_date, end_date, portfolio_weights, moments=None):
         self._stock_data_handler = StockDataHandler(stocks, start_date, end_date)
         self._log_daily_returns = None
+        # running estimator of the daily mean and covariance, updated by append_bar,
+        # RollingMoments or ExponentialMoments from resources.RunningMoments can be
+        # passed instead of the expanding one
+        self._moments = moments if moments is not None else ExpandingMoments(len(stocks))
+        self._last_prices = None
         self._portfolio_weights = portfolio_weights
         self._portfolio_means = list()
         self._portfolio_risks = list()
 
     @property
     def daily_returns(self):
+        # the downloaded history only, bars added by append_bar are in the moments,
+        # pass portfolio_moments to SharpeRatioOptimizer or EfficientFrontier to use them
         return self._log_daily_returns
 
+    @property
+    def moments(self):
+        return self._moments
+
+    @property
+    def portfolio_moments(self):
+        # annualized moments including the appended bars
+        return PortfolioMoments(self.annual_mean_returns, self.annual_covariance)
+
     @property
     def mu(self):
         return MathHandler.portfolio_return(
-            self._log_daily_returns, self._portfolio_weights
+            self.portfolio_moments, self._portfolio_weights
         )
 
     @property
     def sigma(self):
         return MathHandler.portfolio_risks(
-            self._log_daily_returns, self._portfolio_weights
+            self.portfolio_moments, self._portfolio_weights
         )
 
     @property
     def current_portfolio_price(self):
-        return self._stock_data_handler.get_last_price_value()[0]
+        return self._last_prices[0]
+
+    @property
+    def current_prices(self):
+        return self._last_prices
+
+    @property
+    def annual_mean_returns(self):
+        return self._moments.mean * MathHandler.NUM_TRADING_DAYS
+
+    @property
+    def annual_covariance(self):
+        return self._moments.covariance * MathHandler.NUM_TRADING_DAYS
 
     def initialize_portfolio(self):
         self._stock_data_handler.initialize_data()
-        self._log_daily_returns = MathHandler.calculate_log_daily_return(self._stock_data_handler.stock_data)
-        self._portfolio_means.append(
-            MathHandler.portfolio_return(
-                self._log_daily_returns, self._portfolio_weights
-            )
-        )
-        self._portfolio_risks.append(
-            MathHandler.portfolio_risks(
-                self._log_daily_returns, self._portfolio_weights
-            )
-        )
+        self._log_daily_returns = MathHandler.calculate_log_daily_return(self._stock_data_handler.price_panel)
+        self._last_prices = self._stock_data_handler.get_last_price_value().to_numpy()
+        # the estimator is seeded again from the whole history, days where some stock has
+        # no price are left out of the running moments
+        returns = self._stock_data_handler.price_panel.log_returns
+        self._moments.reset()
+        self._moments.update(returns[np.isfinite(returns).all(axis=1)])
+        self._portfolio_means.append(self.mu)
+        self._portfolio_risks.append(self.sigma)
+
+    def append_bar(self, prices):
+        # adds the prices of a new day in the order of the stocks, the moments, mu and
+        # sigma are updated in O(N^2) without touching the downloaded history (daily_returns
+        # does not include the new day, portfolio_moments does)
+        prices = np.asarray(prices, dtype=np.float64)
+        self._moments.update(np.log(prices / self._last_prices))
+        self._last_prices = prices
+        self._portfolio_means.append(self.mu)
+        self._portfolio_risks.append(self.sigma)
 
     def print_kpis(self):
         #print(self._log_daily_returns)
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+
+class PricePanel:
+    # Prices of several tickers held as one C-contiguous [dates, tickers] array with the
+    # date and ticker indexes kept next to it. Log returns are computed once into their
+    # own buffer and handed out as views, DataFrames are only built when asked for.
+    def __init__(self, prices, dates, tickers, dtype=np.float64):
+        self._prices = np.ascontiguousarray(prices, dtype=dtype)
+        self._dates = pd.DatetimeIndex(dates)
+        self._tickers = pd.Index(tickers)
+        if self._prices.shape != (self._dates.size, self._tickers.size):
+            raise ValueError("prices must have shape (len(dates), len(tickers))")
+        self._log_returns = None
+
+    @classmethod
+    def from_series(cls, series, dtype=np.float64):
+        # aligns a dict of ticker -> price Series on the union of their dates, dates a
+        # ticker has no price for are NaN
+        dates = pd.DatetimeIndex(np.unique(np.concatenate(
+            [np.asarray(prices.index, dtype='datetime64[ns]') for prices in series.values()]
+        )))
+        values = np.full((dates.size, len(series)), np.nan, dtype=dtype)
+        for column, prices in enumerate(series.values()):
+            values[dates.get_indexer(prices.index), column] = prices.to_numpy()
+        return cls(values, dates, list(series.keys()), dtype)
+
+    @classmethod
+    def from_frame(cls, frame, dtype=np.float64):
+        return cls(frame.to_numpy(dtype=dtype), frame.index, frame.columns, dtype)
+
+    @property
+    def prices(self):
+        return self._prices
+
+    @property
+    def dates(self):
+        return self._dates
+
+    @property
+    def tickers(self):
+        return self._tickers
+
+    @property
+    def dtype(self):
+        return self._prices.dtype
+
+    @property
+    def shape(self):
+        return self._prices.shape
+
+    @property
+    def log_returns(self):
+        # [dates - 1, tickers] read-only view, row t is log(price[t+1] / price[t])
+        if self._log_returns is None:
+            buffer = np.log(self._prices)
+            np.subtract(buffer[1:], buffer[:-1], out=buffer[1:])
+            self._log_returns = buffer[1:]
+            self._log_returns.flags.writeable = False
+        return self._log_returns
+
+    def last_prices(self):
+        return pd.Series(self._prices[-1], index=self._tickers)
+
+    def to_frame(self):
+        return pd.DataFrame(self._prices, index=self._dates, columns=self._tickers, copy=False)
+
+    def log_returns_frame(self):
+        return pd.DataFrame(self.log_returns, index=self._dates[1:], columns=self._tickers, copy=False)
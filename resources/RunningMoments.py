@@ -0,0 +1,156 @@
+import numpy as np
+
+
+class ExpandingMoments:
+    # Running mean and sample covariance (ddof=1, as DataFrame.cov) of daily return
+    # vectors. A batch of T rows is merged with the Chan et al. parallel update and one
+    # more row costs O(N^2), so new bars never trigger a recomputation over the history.
+    def __init__(self, num_of_assets):
+        self._num_of_assets = num_of_assets
+        self.reset()
+
+    def reset(self):
+        # forgets every observation
+        self._count = 0
+        self._mean = np.zeros(self._num_of_assets)
+        # sum of the cross-products of the deviations from the mean
+        self._comoment = np.zeros((self._num_of_assets, self._num_of_assets))
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def mean(self):
+        return self._mean
+
+    @property
+    def covariance(self):
+        if self._count < 2:
+            return np.full_like(self._comoment, np.nan)
+        return self._comoment / (self._count - 1)
+
+    def update(self, returns):
+        # returns: [N] vector of one day or [T, N] array of T days in time order
+        returns = np.atleast_2d(np.asarray(returns, dtype=np.float64))
+        if returns.shape[0] == 1:
+            self._add(returns[0])
+        elif returns.shape[0] > 1:
+            self._merge(returns)
+
+    def _add(self, row):
+        self._count += 1
+        delta = row - self._mean
+        self._mean = self._mean + delta / self._count
+        self._comoment += np.outer(delta, row - self._mean)
+
+    def _remove(self, row):
+        self._count -= 1
+        if self._count == 0:
+            self._mean = np.zeros_like(self._mean)
+            self._comoment = np.zeros_like(self._comoment)
+            return
+        mean = self._mean - (row - self._mean) / self._count
+        self._comoment -= np.outer(row - mean, row - self._mean)
+        self._mean = mean
+
+    def _merge(self, returns):
+        batch_count = returns.shape[0]
+        batch_mean = returns.mean(axis=0)
+        centered = returns - batch_mean
+        count = self._count + batch_count
+        delta = batch_mean - self._mean
+        self._comoment = (
+            self._comoment + centered.T @ centered + np.outer(delta, delta) * self._count * batch_count / count
+        )
+        self._mean = self._mean + delta * batch_count / count
+        self._count = count
+
+
+class RollingMoments(ExpandingMoments):
+    # Mean and sample covariance of the last window days. The window is kept in a ring
+    # buffer, every new day is added and the day leaving the window is removed with the
+    # inverse Welford update.
+    def __init__(self, num_of_assets, window):
+        self._window = window
+        super().__init__(num_of_assets)
+
+    def reset(self):
+        super().reset()
+        self._buffer = np.empty((self._window, self._num_of_assets))
+        self._position = 0
+
+    @property
+    def window(self):
+        return self._window
+
+    def update(self, returns):
+        returns = np.atleast_2d(np.asarray(returns, dtype=np.float64))
+        if returns.shape[0] >= self._window:
+            # the whole window is replaced, start again from the last window days
+            self.reset()
+            self._buffer[:] = returns[-self._window:]
+            self._merge(self._buffer)
+            return
+        for row in returns:
+            if self._count == self._window:
+                self._remove(self._buffer[self._position])
+            self._buffer[self._position] = row
+            self._position = (self._position + 1) % self._window
+            self._add(row)
+
+
+class ExponentialMoments:
+    # Exponentially weighted mean and covariance in the RiskMetrics form, every new day
+    # gets the weight 1 - decay and the past decays geometrically:
+    #   mean_t = decay * mean_t-1 + (1 - decay) * r_t
+    #   cov_t = decay * (cov_t-1 + (1 - decay) * d d^T),  d = r_t - mean_t-1
+    # The first day seeds the mean, a batch of days is folded in with its weights in
+    # one matrix product.
+    def __init__(self, num_of_assets, decay=0.94):
+        self._num_of_assets = num_of_assets
+        self._decay = decay
+        self.reset()
+
+    def reset(self):
+        # forgets every observation
+        self._count = 0
+        self._mean = np.zeros(self._num_of_assets)
+        self._covariance = np.zeros((self._num_of_assets, self._num_of_assets))
+
+    @property
+    def decay(self):
+        return self._decay
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def mean(self):
+        return self._mean
+
+    @property
+    def covariance(self):
+        return self._covariance
+
+    def update(self, returns):
+        returns = np.atleast_2d(np.asarray(returns, dtype=np.float64))
+        if self._count == 0 and returns.shape[0] > 0:
+            self._mean = returns[0].copy()
+            self._count = 1
+            returns = returns[1:]
+        batch_count = returns.shape[0]
+        if batch_count == 0:
+            return
+        # weight of the current state and of every new day, they sum to one
+        prior_weight = self._decay ** batch_count
+        weights = (1 - self._decay) * self._decay ** np.arange(batch_count - 1, -1, -1)
+        mean = prior_weight * self._mean + weights @ returns
+        centered = returns - mean
+        shift = self._mean - mean
+        self._covariance = (
+            prior_weight * (self._covariance + np.outer(shift, shift)) + (centered.T * weights) @ centered
+        )
+        self._mean = mean
+        self._count += batch_count
@@ -0,0 +1,126 @@
+import numpy as np
+from scipy.special import ndtri
+from scipy.stats import qmc
+
+
+class Sampler:
+    # base class, subclasses provide points of the unit hypercube through _uniforms
+    def __init__(self, seed=None):
+        self._seed = seed
+
+    def uniforms(self, num_of_points, dimension):
+        return self._uniforms(num_of_points, dimension)
+
+    def normals(self, num_of_points, dimension):
+        # inverse-CDF transformation keeps the low discrepancy of the uniform points,
+        # the clipping guards against points exactly on the boundary of the cube
+        uniforms = np.clip(self._uniforms(num_of_points, dimension), 1e-16, 1 - 1e-16)
+        return ndtri(uniforms)
+
+    def _uniforms(self, num_of_points, dimension):
+        raise NotImplementedError
+
+
+class PseudoRandomSampler(Sampler):
+    def __init__(self, seed=None):
+        super().__init__(seed)
+        self._generator = np.random.default_rng(seed)
+
+    def _uniforms(self, num_of_points, dimension):
+        return self._generator.random((num_of_points, dimension))
+
+    def normals(self, num_of_points, dimension):
+        return self._generator.standard_normal((num_of_points, dimension))
+
+
+class QuasiRandomSampler(Sampler):
+    # successive calls continue the same sequence as long as the dimension is unchanged
+    def __init__(self, seed=None, scramble=True):
+        super().__init__(seed)
+        self._scramble = scramble
+        self._engine = None
+
+    def _uniforms(self, num_of_points, dimension):
+        if self._engine is None or self._engine.d != dimension:
+            self._engine = self._create_engine(dimension)
+        return self._engine.random(num_of_points)
+
+    def _create_engine(self, dimension):
+        raise NotImplementedError
+
+
+class SobolSampler(QuasiRandomSampler):
+    # Sobol points keep their balance properties for powers of two number of points
+    def _create_engine(self, dimension):
+        return qmc.Sobol(d=dimension, scramble=self._scramble, seed=self._seed)
+
+
+class HaltonSampler(QuasiRandomSampler):
+    def _create_engine(self, dimension):
+        return qmc.Halton(d=dimension, scramble=self._scramble, seed=self._seed)
+
+
+class BrownianBridge:
+    # Builds Wiener paths at equally spaced times T/N, 2T/N, ..., T from normals so
+    # that the first normal fixes the terminal value, the second the midpoint and so on.
+    # Combined with quasi-random points this puts most of the path variance into the
+    # first, best distributed dimensions.
+    def __init__(self, N, T=None):
+        self._N = N
+        self._times = np.arange(1, N + 1) * ((T if T is not None else N) / N)
+        self._bridge_index = np.zeros(N, dtype=int)
+        self._left_index = np.zeros(N, dtype=int)
+        self._right_index = np.zeros(N, dtype=int)
+        self._left_weight = np.zeros(N)
+        self._right_weight = np.zeros(N)
+        self._stddev = np.zeros(N)
+        self._construct()
+
+    @property
+    def times(self):
+        return self._times
+
+    def _construct(self):
+        t = self._times
+        filled = np.zeros(self._N, dtype=bool)
+        filled[-1] = True
+        self._bridge_index[0] = self._N - 1
+        self._stddev[0] = np.sqrt(t[-1])
+        j = 0
+        for i in range(1, self._N):
+            # find the next unfilled interval [j, k] and bridge its midpoint l
+            while filled[j]:
+                j += 1
+            k = j
+            while not filled[k]:
+                k += 1
+            l = j + ((k - 1 - j) >> 1)
+            filled[l] = True
+            self._bridge_index[i] = l
+            self._left_index[i] = j
+            self._right_index[i] = k
+            t_left = t[j - 1] if j > 0 else 0.0
+            self._left_weight[i] = (t[k] - t[l]) / (t[k] - t_left)
+            self._right_weight[i] = (t[l] - t_left) / (t[k] - t_left)
+            self._stddev[i] = np.sqrt((t[l] - t_left) * (t[k] - t[l]) / (t[k] - t_left))
+            j = k + 1
+            if j >= self._N:
+                j = 0
+
+    def paths(self, normals):
+        # normals: [num_of_paths, N], returns W(t) at the bridge times
+        normals = np.asarray(normals)
+        W = np.empty_like(normals)
+        W[:, -1] = self._stddev[0] * normals[:, 0]
+        for i in range(1, self._N):
+            l = self._bridge_index[i]
+            j = self._left_index[i]
+            k = self._right_index[i]
+            W[:, l] = self._right_weight[i] * W[:, k] + self._stddev[i] * normals[:, i]
+            if j > 0:
+                W[:, l] += self._left_weight[i] * W[:, j - 1]
+        return W
+
+    def increments(self, normals):
+        # W(t_i) - W(t_i-1), normally distributed with variance t_i - t_i-1
+        return np.diff(self.paths(normals), axis=1, prepend=0.0)
@@ -6,11 +6,18 @@ from resources.DataPlotter import DataPlotter
 
 
 class SharpeRatioOptimizer:
-    def __init__(self, log_daily_returns, stocks, num_of_generated_portfolios=10000):
+    def __init__(self, log_daily_returns, stocks, num_of_generated_portfolios=10000, dirichlet_alpha=None,
+                 chunk_size=100000, covariance_estimator=None):
         self._log_daily_returns = log_daily_returns
+        # annualized mean and covariance, estimated once for all the evaluations below
+        self._moments = MathHandler.portfolio_moments(log_daily_returns, covariance_estimator)
         self._stocks = stocks
         self._num_of_stocks = len(stocks)
         self._num_of_generated_portfolios = num_of_generated_portfolios
+        # random portfolios are uniform weights normalized to one unless a Dirichlet
+        # concentration is given, they are drawn and evaluated chunk_size at a time
+        self._dirichlet_alpha = dirichlet_alpha
+        self._chunk_size = chunk_size
         self._portfolio_weights = list()
         self._portfolio_means = list()
         self._portfolio_risks = list()
@@ -19,12 +26,12 @@ class SharpeRatioOptimizer:
     def calculate_optimal_portfolio(self):
         self._generate_portfolios()
         self._optimum = SharpeRatioOptimizer.optimize_portfolio(
-            self._portfolio_weights, self._log_daily_returns, self._num_of_stocks
+            self._portfolio_weights, self._moments, self._num_of_stocks
         )
 
     def show_portfolios_with_sharpe_ratio(self):
-        val1 = SharpeRatioOptimizer.statistics(self._optimum['x'], self._log_daily_returns)[1]
-        val2 = SharpeRatioOptimizer.statistics(self._optimum['x'], self._log_daily_returns)[0]
+        val1 = SharpeRatioOptimizer.statistics(self._optimum['x'], self._moments)[1]
+        val2 = SharpeRatioOptimizer.statistics(self._optimum['x'], self._moments)[0]
         DataPlotter.show_portfolios_scatter_with_sharpe_ratio(
             self._optimum, self._log_daily_returns, self._portfolio_means, self._portfolio_risks, val1, val2
         )
@@ -35,30 +42,21 @@ class SharpeRatioOptimizer:
         print(
             "Expected return, risk and Sharpe ratio: ",
             SharpeRatioOptimizer.statistics(
-                self._optimum['x'].round(3), self._log_daily_returns
+                self._optimum['x'].round(3), self._moments
             )
         )
 
     def _generate_portfolios(self):
-        for i in range(self._num_of_generated_portfolios):
-            weight = MathHandler.get_random_weight(self._num_of_stocks)
-            self._portfolio_weights.append(weight)
-            self._portfolio_means.append(
-                MathHandler.portfolio_return(
-                    self._log_daily_returns, weight
-                )
-            )
-            self._portfolio_risks.append(
-                MathHandler.portfolio_risks(
-                    self._log_daily_returns, weight
-                )
-            )
-        self._transform_to_np_arrrays()
-
-    def _transform_to_np_arrrays(self):
-        self._portfolio_weights = np.array(self._portfolio_weights)
-        self._portfolio_risks = np.array(self._portfolio_risks)
-        self._portfolio_means = np.array(self._portfolio_means)
+        num_of_portfolios = self._num_of_generated_portfolios
+        self._portfolio_weights = np.empty((num_of_portfolios, self._num_of_stocks))
+        self._portfolio_means = np.empty(num_of_portfolios)
+        self._portfolio_risks = np.empty(num_of_portfolios)
+        for start in range(0, num_of_portfolios, self._chunk_size):
+            end = min(start + self._chunk_size, num_of_portfolios)
+            weights = MathHandler.get_random_weights(end - start, self._num_of_stocks, self._dirichlet_alpha)
+            self._portfolio_weights[start:end] = weights
+            self._portfolio_means[start:end] = MathHandler.portfolios_returns(self._moments, weights)
+            self._portfolio_risks[start:end] = MathHandler.portfolios_risks(self._moments, weights)
 
     @staticmethod
     def statistics(weights, returns):
@@ -72,16 +70,28 @@ class SharpeRatioOptimizer:
     def min_function_sharpe(weights, returns):
         return -SharpeRatioOptimizer.statistics(weights, returns)[2]
 
+    @staticmethod
+    def gradient_sharpe(weights, returns):
+        # gradient of min_function_sharpe, with r = w^T mu and sigma^2 = w^T C w
+        # d(-r/sigma)/dw = -mu/sigma + r * C w / sigma^3
+        moments = MathHandler.portfolio_moments(returns)
+        covariance_weights = moments.covariance_product(weights)
+        portfolio_return = moments.mean @ weights
+        portfolio_volatility = np.sqrt(weights @ covariance_weights)
+        return -moments.mean / portfolio_volatility + portfolio_return * covariance_weights / portfolio_volatility ** 3
+
     @staticmethod
     def optimize_portfolio(weights, returns, num_of_stocks):
         # constraint of lambda is that the sum of weights - 1 = 0
         constraints = {
-            'type': 'eq', 'fun': lambda x: np.sum(x) - 1
+            'type': 'eq', 'fun': lambda x: np.sum(x) - 1, 'jac': lambda x: np.ones_like(x)
         }
         bounds = tuple(
             (0, 1) for i in range(num_of_stocks)
         )
+        # the objective is evaluated against moments computed once, not the raw returns
+        moments = MathHandler.portfolio_moments(returns)
         return optimization.minimize(
-            fun=SharpeRatioOptimizer.min_function_sharpe, x0=weights[0], args=returns,
-            method='SLSQP', bounds=bounds, constraints=constraints
+            fun=SharpeRatioOptimizer.min_function_sharpe, x0=weights[0], args=moments,
+            jac=SharpeRatioOptimizer.gradient_sharpe, method='SLSQP', bounds=bounds, constraints=constraints
         )
\ No newline at end of file
@@ -1,27 +1,48 @@
-import yfinance as yf
-import pandas as pd
+import numpy as np
+
+from resources.MarketDataProvider import YahooFinanceProvider
+from resources.PricePanel import PricePanel
 
 
 class StockDataHandler:
-    def __init__(self, stocks, start_date, end_date, open_or_close='Adj Close'):
+    def __init__(self, stocks, start_date, end_date, open_or_close='Adj Close', provider=None, cache=None,
+                 dtype=np.float64):
         self._stocks = stocks
         self._start_date = start_date
         self._end_date = end_date
         self._open_or_close = open_or_close
-        self._stock_data = pd.DataFrame()
+        # a MarketDataCache serves the data from disk and only fetches missing ranges,
+        # otherwise the provider (Yahoo Finance by default) is queried directly
+        self._provider = provider if provider is not None else YahooFinanceProvider()
+        self._cache = cache
+        self._dtype = dtype
+        self._price_panel = None
+        self._stock_data = None
 
     def initialize_data(self):
         self._download_data()
 
     def _download_data(self):
-        stock_data = dict()
-        for stock in self._stocks:
-            ticker = yf.download(stock, self._start_date, self._end_date)
-            stock_data[stock] = ticker[self._open_or_close]
-        self._stock_data = pd.DataFrame(stock_data)
+        # all tickers are requested in bulk and aligned on their dates in one array
+        if self._cache is not None:
+            stock_data = self._cache.get_many(self._stocks, self._open_or_close, self._start_date, self._end_date)
+        else:
+            tickers = self._provider.download_many(self._stocks, self._start_date, self._end_date)
+            stock_data = {stock: tickers[stock][self._open_or_close] for stock in self._stocks}
+        self._price_panel = PricePanel.from_series(
+            {stock: stock_data[stock] for stock in self._stocks}, self._dtype
+        )
+        self._stock_data = None
+
+    @property
+    def price_panel(self):
+        return self._price_panel
 
     @property
     def stock_data(self):
+        # the DataFrame is only built on first access and shares the panel's memory
+        if self._stock_data is None and self._price_panel is not None:
+            self._stock_data = self._price_panel.to_frame()
         return self._stock_data
 
     @property
@@ -29,4 +50,4 @@ class StockDataHandler:
         return self._stocks
 
     def get_last_price_value(self):
-        return self._stock_data.iloc[-1]
+        return self._price_panel.last_prices()
@@ -2,36 +2,137 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from resources.ParallelMonteCarlo import ParallelMonteCarlo
+from resources.PathStatistics import PathStatistics
+from resources.PathStore import PathStore
+from resources.Samplers import BrownianBridge, PseudoRandomSampler
+
 
 class StockMonteCarlo:
-    def __init__(self, S0, mu, sigma, N=252, NUM_OF_SIMULATIONS=1000):
+    def __init__(self, S0, mu, sigma, N=252, NUM_OF_SIMULATIONS=1000, sampler=None, brownian_bridge=False,
+                 dtype=np.float64):
         self._S0 = S0
         self._mu = mu
         self._sigma = sigma
         self._N = N
         self._NUM_OF_SIMULATIONS = NUM_OF_SIMULATIONS
+        # a Sampler from resources.Samplers, the global np.random state is used if None
+        self._sampler = sampler
+        self._brownian_bridge = brownian_bridge
+        self._dtype = dtype
+        self._paths = None
+        self._statistics = None
         self._simulation_data= pd.DataFrame()
 
-    def simulate_random_walk(self):
-        result = list()
-        # number of simulations - possible S(t) realizations of the process
-        for i in range(self._NUM_OF_SIMULATIONS):
-            prices = [self._S0]
-            for j in range(self._N):
-                # we simulate the change day by day (t=1)
-                stock_price = \
-                    prices[-1] * np.exp(
-                        (self._mu - 0.5 * self._sigma ** 2) + self._sigma * np.random.normal()
-                    )
-                prices.append(stock_price)
-            result.append(prices)
-        self._simulation_data = pd.DataFrame(result)
-        self._simulation_data = self._simulation_data.T
+    @property
+    def paths(self):
+        # [N + 1, NUM_OF_SIMULATIONS] array, one column per simulated path
+        return self._paths
+
+    @property
+    def simulation_data(self):
+        return self._simulation_data
+
+    @property
+    def statistics(self):
+        return self._statistics
+
+    def simulate_random_walk(self, store=None):
+        # with a PathStore the paths are written into its shared buffer, paths and
+        # simulation_data are views that keep it mapped until release_paths
+        self._paths = self.simulate_paths(None if store is None else store.array)
+        # the DataFrame wraps the path array without copying it
+        self._simulation_data = pd.DataFrame(self._paths, copy=False)
+
+    def release_paths(self):
+        # drops the references to the last simulated paths, which frees the memory of a
+        # closed PathStore they were simulated into
+        self._paths = None
+        self._simulation_data = pd.DataFrame()
+
+    def simulate_paths(self, out=None):
+        # we simulate the change day by day (t=1): all log increments are drawn at once,
+        # cumulatively summed along the time axis and exponentiated in place
+        normals = self._draw_normals().astype(self._dtype, copy=False)
+        paths = out if out is not None else np.empty((self._N + 1, self._NUM_OF_SIMULATIONS), dtype=self._dtype)
+        paths[0] = 0
+        log_increments = normals.T
+        log_increments *= self._sigma
+        log_increments += self._mu - 0.5 * self._sigma ** 2
+        np.cumsum(log_increments, axis=0, out=paths[1:])
+        np.exp(paths, out=paths)
+        paths *= self._S0
+        return paths
+
+    def simulate_paths_parallel(self, seed=None, workers=None, block_size=10000, store=None):
+        # blocks of paths are simulated in worker processes with independent streams spawned
+        # from the seed and stacked in block order, with a PathStore every worker writes
+        # its columns straight into the shared buffer and the store's array is returned
+        blocks = ParallelMonteCarlo(workers, block_size).map_blocks(
+            _simulate_paths_block, self._NUM_OF_SIMULATIONS, seed,
+            (self._S0, self._mu, self._sigma, self._N), self._brownian_bridge, self._dtype,
+            None if store is None else store.descriptor, pass_offsets=True
+        )
+        if store is not None:
+            return store.array
+        return np.concatenate(blocks, axis=1)
+
+    def simulate_statistics(self, batch_size=10000, compression=200):
+        # paths are generated batch by batch and only folded into per step running
+        # statistics, so memory is O(N) instead of O(N * NUM_OF_SIMULATIONS)
+        self._statistics = PathStatistics(self._N + 1, compression)
+        simulated = 0
+        while simulated < self._NUM_OF_SIMULATIONS:
+            size = min(batch_size, self._NUM_OF_SIMULATIONS - simulated)
+            batch = StockMonteCarlo(
+                self._S0, self._mu, self._sigma, self._N, size, sampler=self._sampler,
+                brownian_bridge=self._brownian_bridge, dtype=self._dtype
+            )
+            self._statistics.update(batch.simulate_paths())
+            simulated += size
+        return self._statistics
+
+    def _draw_normals(self):
+        # [NUM_OF_SIMULATIONS, N] daily shocks, drawn in the same order as step by step
+        if self._sampler is None:
+            normals = np.random.normal(size=(self._NUM_OF_SIMULATIONS, self._N))
+        else:
+            normals = self._sampler.normals(self._NUM_OF_SIMULATIONS, self._N)
+        if self._brownian_bridge:
+            normals = BrownianBridge(self._N).increments(normals)
+        return normals
 
     def plot_all_values(self):
         plt.plot(self._simulation_data)
         plt.show()
 
     def plot_mean_value(self):
-        plt.plot(self._simulation_data.mean(axis=1))
-        plt.show()
\ No newline at end of file
+        if self._simulation_data.empty and self._statistics is not None:
+            plt.plot(self._statistics.mean)
+        else:
+            plt.plot(self._simulation_data.mean(axis=1))
+        plt.show()
+
+    def plot_fan_chart(self, quantiles=(0.05, 0.25, 0.75, 0.95)):
+        # needs simulate_statistics, bands between symmetric quantiles around the median
+        steps = np.arange(self._N + 1)
+        for lower, upper in zip(quantiles[:len(quantiles) // 2], reversed(quantiles)):
+            plt.fill_between(
+                steps, self._statistics.quantile(lower), self._statistics.quantile(upper), alpha=0.3
+            )
+        plt.plot(steps, self._statistics.quantile(0.5))
+        plt.show()
+
+
+def _simulate_paths_block(model_parameters, brownian_bridge, dtype, store_descriptor, offset, size, seed_sequence):
+    # runs in a worker process, returns the [N + 1, size] block of paths or writes it into
+    # the columns [offset, offset + size) of the attached path store
+    model = StockMonteCarlo(
+        *model_parameters, size, sampler=PseudoRandomSampler(seed_sequence),
+        brownian_bridge=brownian_bridge, dtype=dtype
+    )
+    if store_descriptor is None:
+        return model.simulate_paths()
+    store = PathStore.attach(store_descriptor)
+    model.simulate_paths(store.array[:, offset:offset + size])
+    store.close()
@@ -23,6 +23,7 @@ SOFTWARE.
 """
 
 
+import importlib.util
 import math
 
 HASNUMPY = 1
@@ -33,14 +34,20 @@ except ImportError:
     print("Plotting functions inoperable")
     HASNUMPY = 0
 
+# matplotlib.pyplot is only imported on first use of a plotting function, since the
+# import and backend initialization dominate the load time of this module.
 HASMATPLOTLIB = 1
-try:
-    import matplotlib.pyplot as plt
-except ImportError:
+if importlib.util.find_spec("matplotlib") is None:
     print("Plotting functions require Matplotlib")
     print("Plotting functions inoperable")
     HASMATPLOTLIB = 0
 
+
+def _import_pyplot():
+    import matplotlib.pyplot as plt
+    return plt
+
+
 #Interpolator classes needed for yield curves
 class abstract_interpolator:
 
@@ -737,6 +744,7 @@ class curve:
         if max_tenor <= 0:
             max_tenor = max(self.tenors)
         
+        plt = _import_pyplot()
         fig, ax = plt.subplots()
 
         t = np.arange(0.0, max_tenor, 0.1)
@@ -775,6 +783,7 @@ class curve:
         if max_tenor <= 0:
             max_tenor = max(self.tenors)
 
+        plt = _import_pyplot()
         fig, ax = plt.subplots()
 
         t = np.arange(0.0, max_tenor, 0.1)
@@ -820,6 +829,7 @@ class curve:
         if maturity <= 0:
             maturity = max(self.tenors)
 
+        plt = _import_pyplot()
         fig, ax = plt.subplots()
 
         t = np.arange(expiration, maturity, 0.1)
@@ -959,6 +969,7 @@ class abstract_bond:
             print("Plotting functions require Matplotlib")
             return
         
+        plt = _import_pyplot()
         fig, ax = plt.subplots()
 
         ax.bar(self.dates, self.coupons, width=0.2)
@@ -22,8 +22,11 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-from math import exp, log, sqrt
-from scipy.stats import norm
+import importlib.util
+import sys
+from math import exp, log, pi, sqrt
+
+from resources.specialfunctions import norm_cdf, norm_pdf, norm_ppf
 
 HASNUMPY = 1
 try:
@@ -33,15 +36,20 @@ except ImportError:
     print("Plotting functions inoperable")
     HASNUMPY = 0
 
+# matplotlib.pyplot is only imported on first use of a plotting function, since the
+# import and backend initialization dominate the load time of this module.
 HASMATPLOTLIB = 1
-try:
-    import matplotlib.pyplot as plt
-except ImportError:
+if importlib.util.find_spec("matplotlib") is None:
     print("Plotting functions require Matplotlib")
     print("Plotting functions inoperable")
     HASMATPLOTLIB = 0
 
 
+def _import_pyplot():
+    import matplotlib.pyplot as plt
+    return plt
+
+
 def BSCall(spot, time, strike, expiry, vol, rate):
     """
         Calculates the Black-Scholes call price.
@@ -71,7 +79,7 @@ def BSCall(spot, time, strike, expiry, vol, rate):
     rate /= 100
     d1 = (log(spot/strike)+(rate+vol**2/2) * (expiry - time)) / vol / sqrt(expiry - time)
     d2 = (log(spot/strike)+(rate-vol**2/2) * (expiry - time)) / vol / sqrt(expiry - time)
-    return spot*norm.cdf(d1)-strike * exp(-rate*(expiry - time))*norm.cdf(d2)
+    return spot*norm_cdf(d1)-strike * exp(-rate*(expiry - time))*norm_cdf(d2)
 
 def BSPut(spot, time, strike, expiry, vol, rate):
     """
@@ -102,7 +110,7 @@ def BSPut(spot, time, strike, expiry, vol, rate):
     rate /= 100
     d1 = (log(spot/strike)+(rate+vol**2/2) * (expiry - time)) / vol / sqrt(expiry - time)
     d2 = (log(spot/strike)+(rate-vol**2/2) * (expiry - time)) / vol / sqrt(expiry - time)
-    return -spot*norm.cdf(-d1) + strike * exp(-rate*(expiry - time))*norm.cdf(-d2)
+    return -spot*norm_cdf(-d1) + strike * exp(-rate*(expiry - time))*norm_cdf(-d2)
 
 def BSCall_Delta(spot, time, strike, expiry, vol, rate):
     """
@@ -132,7 +140,7 @@ def BSCall_Delta(spot, time, strike, expiry, vol, rate):
     vol /= 100
     rate /= 100
     d1 = (log(spot/strike)+(rate+vol**2/2) * (expiry - time)) / vol / sqrt(expiry - time)
-    return norm.cdf(d1)
+    return norm_cdf(d1)
 
 def BSPut_Delta(spot, time, strike, expiry, vol, rate):
     """
@@ -162,7 +170,7 @@ def BSPut_Delta(spot, time, strike, expiry, vol, rate):
     vol /= 100
     rate /= 100
     d1 = (log(spot/strike)+(rate+vol**2/2) * (expiry - time)) / vol / sqrt(expiry - time)
-    return -norm.cdf(-d1)
+    return -norm_cdf(-d1)
 
 def BSCall_Gamma(spot, time, strike, expiry, vol, rate):
     """
@@ -192,7 +200,7 @@ def BSCall_Gamma(spot, time, strike, expiry, vol, rate):
     vol /= 100
     rate /= 100
     d1 = (log(spot/strike)+(rate+vol**2/2) * (expiry - time)) / vol / sqrt(expiry - time)
-    return norm.pdf(d1)/spot/vol/sqrt(expiry-time)
+    return norm_pdf(d1)/spot/vol/sqrt(expiry-time)
 
 def BSPut_Gamma(spot, time, strike, expiry, vol, rate):
     """
@@ -222,7 +230,7 @@ def BSPut_Gamma(spot, time, strike, expiry, vol, rate):
     vol /= 100
     rate /= 100
     d1 = (log(spot/strike)+(rate+vol**2/2) * (expiry - time)) / vol / sqrt(expiry - time)
-    return norm.pdf(d1)/spot/vol/sqrt(expiry-time)
+    return norm_pdf(d1)/spot/vol/sqrt(expiry-time)
 
 def BSCall_Theta(spot, time, strike, expiry, vol, rate):
     """
@@ -254,7 +262,7 @@ def BSCall_Theta(spot, time, strike, expiry, vol, rate):
     rate /= 100
     d1 = (log(spot/strike)+(rate+vol**2/2) * (expiry - time)) / vol / sqrt(expiry - time)
     d2 = (log(spot/strike)+(rate-vol**2/2) * (expiry - time)) / vol / sqrt(expiry - time)
-    theta = -spot*vol*norm.pdf(d1)/2/sqrt(expiry - time) - rate * strike *exp(-rate *(expiry-time)) * norm.cdf(d2)
+    theta = -spot*vol*norm_pdf(d1)/2/sqrt(expiry - time) - rate * strike *exp(-rate *(expiry-time)) * norm_cdf(d2)
     return theta / 365
 
 def BSPut_Theta(spot, time, strike, expiry, vol, rate):
@@ -287,7 +295,7 @@ def BSPut_Theta(spot, time, strike, expiry, vol, rate):
     rate /= 100
     d1 = (log(spot/strike)+(rate+vol**2/2) * (expiry - time)) / vol / sqrt(expiry - time)
     d2 = (log(spot/strike)+(rate-vol**2/2) * (expiry - time)) / vol / sqrt(expiry - time)
-    theta = -spot*vol*norm.pdf(d1)/2/sqrt(expiry - time) + rate * strike *exp(-rate *(expiry-time)) * norm.cdf(-d2)
+    theta = -spot*vol*norm_pdf(d1)/2/sqrt(expiry - time) + rate * strike *exp(-rate *(expiry-time)) * norm_cdf(-d2)
     return theta / 365
 
 def BSCall_Vega(spot, time, strike, expiry, vol, rate):
@@ -318,7 +326,7 @@ def BSCall_Vega(spot, time, strike, expiry, vol, rate):
     vol /= 100
     rate /= 100
     d1 = (log(spot/strike)+(rate+vol**2/2) * (expiry - time)) / vol / sqrt(expiry - time)
-    return spot*sqrt(expiry - time) * norm.pdf(d1) / 100
+    return spot*sqrt(expiry - time) * norm_pdf(d1) / 100
 
 def BSPut_Vega(spot, time, strike, expiry, vol, rate):
     """
@@ -348,14 +356,599 @@ def BSPut_Vega(spot, time, strike, expiry, vol, rate):
     vol /= 100
     rate /= 100
     d1 = (log(spot/strike)+(rate+vol**2/2) * (expiry - time)) / vol / sqrt(expiry - time)
-    return spot*sqrt(expiry - time) * norm.pdf(d1) / 100
+    return spot*sqrt(expiry - time) * norm_pdf(d1) / 100
+
+
+def _bs_d1_d2_array(spot, time, strike, expiry, vol, rate):
+    """
+        Broadcasts the Black-Scholes inputs against each other and computes d1 and d2.
+
+        Volatility and rate are converted from percentages without modifying the
+        arrays passed in by the caller.
+
+        Returns
+        -------
+        tuple of ndarray
+            spot, strike, time to expiry, vol, rate, d1 and d2.
+    """
+
+    spot, time, strike, expiry, vol, rate = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (spot, time, strike, expiry, vol, rate)))
+    vol = vol / 100
+    rate = rate / 100
+    tau = expiry - time
+    vol_sqrt_tau = vol * np.sqrt(tau)
+    d1 = (np.log(spot/strike) + (rate + vol**2/2) * tau) / vol_sqrt_tau
+    d2 = d1 - vol_sqrt_tau
+    return spot, strike, tau, vol, rate, d1, d2
+
+def BSCall_Array(spot, time, strike, expiry, vol, rate):
+    """
+        Calculates the Black-Scholes call price for arrays of inputs.
+
+        All arguments are broadcast against each other using the NumPy rules, so a whole
+        option chain can be priced in a single call.
+
+        Parameters
+        ----------
+        spot: float or array_like
+            The spot price of the underlying.
+        time: float or array_like
+            The time when the call price is to be evaluated.
+        strike: float or array_like
+            The strike price of the call.
+        expiry: float or array_like
+            The expiration date of the call.
+        vol: float or array_like
+            The implied volatility to use to price the call (as a percentage).
+        rate: float or array_like
+            The risk free interest rate to use in the model (as a percentage).
+
+        Returns
+        -------
+        ndarray
+            The Black-Scholes call prices.
+    """
+
+    spot, strike, tau, vol, rate, d1, d2 = _bs_d1_d2_array(spot, time, strike, expiry, vol, rate)
+    return spot*norm_cdf(d1) - strike * np.exp(-rate*tau)*norm_cdf(d2)
+
+def BSPut_Array(spot, time, strike, expiry, vol, rate):
+    """
+        Calculates the Black-Scholes put price for arrays of inputs.
+
+        Parameters
+        ----------
+        spot: float or array_like
+            The spot price of the underlying.
+        time: float or array_like
+            The time when the put price is to be evaluated.
+        strike: float or array_like
+            The strike price of the put.
+        expiry: float or array_like
+            The expiration date of the put.
+        vol: float or array_like
+            The implied volatility to use to price the put (as a percentage).
+        rate: float or array_like
+            The risk free interest rate to use in the model (as a percentage).
+
+        Returns
+        -------
+        ndarray
+            The Black-Scholes put prices.
+    """
+
+    spot, strike, tau, vol, rate, d1, d2 = _bs_d1_d2_array(spot, time, strike, expiry, vol, rate)
+    return -spot*norm_cdf(-d1) + strike * np.exp(-rate*tau)*norm_cdf(-d2)
+
+def BSCall_Delta_Array(spot, time, strike, expiry, vol, rate):
+    """
+        Calculates the Black-Scholes call delta for arrays of inputs.
+
+        Parameters
+        ----------
+        spot: float or array_like
+            The spot price of the underlying.
+        time: float or array_like
+            The time when the call delta is to be evaluated.
+        strike: float or array_like
+            The strike price of the call.
+        expiry: float or array_like
+            The expiration date of the call.
+        vol: float or array_like
+            The implied volatility to use (as a percentage).
+        rate: float or array_like
+            The risk free interest rate to use in the model (as a percentage).
 
+        Returns
+        -------
+        ndarray
+            The Black-Scholes call deltas.
+    """
 
-def implied_vol(price, spot, strike, expiry, rate):
+    spot, strike, tau, vol, rate, d1, d2 = _bs_d1_d2_array(spot, time, strike, expiry, vol, rate)
+    return norm_cdf(d1)
+
+def BSPut_Delta_Array(spot, time, strike, expiry, vol, rate):
     """
-        This function provides a partial implementation of Jaeckel's optimized algorithm
-        for computing implied volatility (https://jaeckel.000webhostapp.com/ByImplication.pdf)
-        Currently, only calls are implemented.
+        Calculates the Black-Scholes put delta for arrays of inputs.
+
+        Parameters
+        ----------
+        spot: float or array_like
+            The spot price of the underlying.
+        time: float or array_like
+            The time when the put delta is to be evaluated.
+        strike: float or array_like
+            The strike price of the put.
+        expiry: float or array_like
+            The expiration date of the put.
+        vol: float or array_like
+            The implied volatility to use (as a percentage).
+        rate: float or array_like
+            The risk free interest rate to use in the model (as a percentage).
+
+        Returns
+        -------
+        ndarray
+            The Black-Scholes put deltas.
+    """
+
+    spot, strike, tau, vol, rate, d1, d2 = _bs_d1_d2_array(spot, time, strike, expiry, vol, rate)
+    return -norm_cdf(-d1)
+
+def BSCall_Gamma_Array(spot, time, strike, expiry, vol, rate):
+    """
+        Calculates the Black-Scholes call gamma for arrays of inputs.
+
+        Parameters
+        ----------
+        spot: float or array_like
+            The spot price of the underlying.
+        time: float or array_like
+            The time when the call gamma is to be evaluated.
+        strike: float or array_like
+            The strike price of the call.
+        expiry: float or array_like
+            The expiration date of the call.
+        vol: float or array_like
+            The implied volatility to use (as a percentage).
+        rate: float or array_like
+            The risk free interest rate to use in the model (as a percentage).
+
+        Returns
+        -------
+        ndarray
+            The Black-Scholes call gammas.
+    """
+
+    spot, strike, tau, vol, rate, d1, d2 = _bs_d1_d2_array(spot, time, strike, expiry, vol, rate)
+    return norm_pdf(d1)/spot/vol/np.sqrt(tau)
+
+def BSPut_Gamma_Array(spot, time, strike, expiry, vol, rate):
+    """
+        Calculates the Black-Scholes put gamma for arrays of inputs.
+
+        Parameters
+        ----------
+        spot: float or array_like
+            The spot price of the underlying.
+        time: float or array_like
+            The time when the put gamma is to be evaluated.
+        strike: float or array_like
+            The strike price of the put.
+        expiry: float or array_like
+            The expiration date of the put.
+        vol: float or array_like
+            The implied volatility to use (as a percentage).
+        rate: float or array_like
+            The risk free interest rate to use in the model (as a percentage).
+
+        Returns
+        -------
+        ndarray
+            The Black-Scholes put gammas.
+    """
+
+    return BSCall_Gamma_Array(spot, time, strike, expiry, vol, rate)
+
+def BSCall_Theta_Array(spot, time, strike, expiry, vol, rate):
+    """
+        Calculates the 1 day Black-Scholes call theta for arrays of inputs.
+
+        Parameters
+        ----------
+        spot: float or array_like
+            The spot price of the underlying.
+        time: float or array_like
+            The time when the call theta is to be evaluated.
+        strike: float or array_like
+            The strike price of the call.
+        expiry: float or array_like
+            The expiration date of the call.
+        vol: float or array_like
+            The implied volatility to use (as a percentage).
+        rate: float or array_like
+            The risk free interest rate to use in the model (as a percentage).
+
+        Returns
+        -------
+        ndarray
+            The 1 day Black-Scholes call thetas.
+    """
+
+    spot, strike, tau, vol, rate, d1, d2 = _bs_d1_d2_array(spot, time, strike, expiry, vol, rate)
+    theta = -spot*vol*norm_pdf(d1)/2/np.sqrt(tau) - rate * strike * np.exp(-rate*tau) * norm_cdf(d2)
+    return theta / 365
+
+def BSPut_Theta_Array(spot, time, strike, expiry, vol, rate):
+    """
+        Calculates the 1 day Black-Scholes put theta for arrays of inputs.
+
+        Parameters
+        ----------
+        spot: float or array_like
+            The spot price of the underlying.
+        time: float or array_like
+            The time when the put theta is to be evaluated.
+        strike: float or array_like
+            The strike price of the put.
+        expiry: float or array_like
+            The expiration date of the put.
+        vol: float or array_like
+            The implied volatility to use (as a percentage).
+        rate: float or array_like
+            The risk free interest rate to use in the model (as a percentage).
+
+        Returns
+        -------
+        ndarray
+            The 1 day Black-Scholes put thetas.
+    """
+
+    spot, strike, tau, vol, rate, d1, d2 = _bs_d1_d2_array(spot, time, strike, expiry, vol, rate)
+    theta = -spot*vol*norm_pdf(d1)/2/np.sqrt(tau) + rate * strike * np.exp(-rate*tau) * norm_cdf(-d2)
+    return theta / 365
+
+def BSCall_Vega_Array(spot, time, strike, expiry, vol, rate):
+    """
+        Calculates the Black-Scholes call vega for arrays of inputs.
+
+        Parameters
+        ----------
+        spot: float or array_like
+            The spot price of the underlying.
+        time: float or array_like
+            The time when the call vega is to be evaluated.
+        strike: float or array_like
+            The strike price of the call.
+        expiry: float or array_like
+            The expiration date of the call.
+        vol: float or array_like
+            The implied volatility to use (as a percentage).
+        rate: float or array_like
+            The risk free interest rate to use in the model (as a percentage).
+
+        Returns
+        -------
+        ndarray
+            The Black-Scholes call vegas.
+    """
+
+    spot, strike, tau, vol, rate, d1, d2 = _bs_d1_d2_array(spot, time, strike, expiry, vol, rate)
+    return spot*np.sqrt(tau) * norm_pdf(d1) / 100
+
+def BSPut_Vega_Array(spot, time, strike, expiry, vol, rate):
+    """
+        Calculates the Black-Scholes put vega for arrays of inputs.
+
+        Parameters
+        ----------
+        spot: float or array_like
+            The spot price of the underlying.
+        time: float or array_like
+            The time when the put vega is to be evaluated.
+        strike: float or array_like
+            The strike price of the put.
+        expiry: float or array_like
+            The expiration date of the put.
+        vol: float or array_like
+            The implied volatility to use (as a percentage).
+        rate: float or array_like
+            The risk free interest rate to use in the model (as a percentage).
+
+        Returns
+        -------
+        ndarray
+            The Black-Scholes put vegas.
+    """
+
+    return BSCall_Vega_Array(spot, time, strike, expiry, vol, rate)
+
+
+def BS_Risk_Array(spot, time, strike, expiry, vol, rate, type="call"):
+    """
+        Calculates the Black-Scholes price together with delta, gamma, vega, theta and
+        rho from a single evaluation of d1, d2 and the normal density.
+
+        Parameters
+        ----------
+        spot: float or array_like
+            The spot price of the underlying.
+        time: float or array_like
+            The time when the option is to be evaluated.
+        strike: float or array_like
+            The strike price of the option.
+        expiry: float or array_like
+            The expiration date of the option.
+        vol: float or array_like
+            The implied volatility to use (as a percentage).
+        rate: float or array_like
+            The risk free interest rate to use in the model (as a percentage).
+        type: string or array_like
+            Either "call" or "put", or an array of them broadcastable against the other
+            inputs.
+
+        Returns
+        -------
+        dict
+            Arrays keyed by "price", "delta", "gamma", "vega", "theta" and "rho". Theta is
+            the 1 day theta, vega and rho are per one percentage point.
+    """
+
+    spot, strike, tau, vol, rate, d1, d2 = _bs_d1_d2_array(spot, time, strike, expiry, vol, rate)
+    sign = np.where(np.asarray(type) == "call", 1.0, -1.0)
+    sqrt_tau = np.sqrt(tau)
+    discounted_strike = strike * np.exp(-rate*tau)
+    pdf_d1 = norm_pdf(d1)
+    cdf_d1 = norm_cdf(sign*d1)
+    cdf_d2 = norm_cdf(sign*d2)
+
+    return {
+        "price": sign * (spot*cdf_d1 - discounted_strike*cdf_d2),
+        "delta": sign * cdf_d1,
+        "gamma": pdf_d1/spot/vol/sqrt_tau,
+        "vega": spot*sqrt_tau*pdf_d1 / 100,
+        "theta": (-spot*vol*pdf_d1/2/sqrt_tau - sign*rate*discounted_strike*cdf_d2) / 365,
+        "rho": sign * tau*discounted_strike*cdf_d2 / 100,
+    }
+
+
+_DBL_EPSILON = sys.float_info.epsilon
+_DBL_MIN = sys.float_info.min
+_DBL_MAX = sys.float_info.max
+_SQRT_DBL_MAX = sqrt(_DBL_MAX)
+_ONE_OVER_SQRT_TWO_PI = 1 / sqrt(2 * pi)
+_SQRT_PI_OVER_TWO = sqrt(pi / 2)
+_SQRT_THREE = sqrt(3)
+_SQRT_ONE_OVER_THREE = sqrt(1 / 3)
+_TWO_PI_OVER_SQRT_TWENTY_SEVEN = 2 * pi / sqrt(27)
+_PI_OVER_SIX = pi / 6
+_MINIMUM_RATIONAL_CUBIC_CONTROL_PARAMETER = -(1 - sqrt(_DBL_EPSILON))
+_MAXIMUM_RATIONAL_CUBIC_CONTROL_PARAMETER = 2 / (_DBL_EPSILON * _DBL_EPSILON)
+_IMPLIED_VOL_ITERATIONS = 2
+
+
+def _normalised_black_call(x, s):
+    # b(x, s) = exp(x/2)N(x/s + s/2) - exp(-x/2)N(x/s - s/2), only used with x <= 0
+    if s <= 0:
+        return 0.0
+    h = x / s
+    t = s / 2
+    return exp(x/2) * norm_cdf(h + t) - exp(-x/2) * norm_cdf(h - t)
+
+
+def _normalised_vega(x, s):
+    if s <= 0:
+        return 0.0
+    return _ONE_OVER_SQRT_TWO_PI * exp(-0.5 * ((x/s)**2 + (s/2)**2))
+
+
+def _householder_factor(newton, halley, hh3):
+    return (1 + 0.5 * halley * newton) / (1 + newton * (halley + hh3 * newton / 6))
+
+
+def _rational_cubic_interpolation(x, x_l, x_r, y_l, y_r, d_l, d_r, r):
+    h = x_r - x_l
+    if abs(h) <= 0:
+        return 0.5 * (y_l + y_r)
+    t = (x - x_l) / h
+    if r >= _MAXIMUM_RATIONAL_CUBIC_CONTROL_PARAMETER:
+        return y_r * t + y_l * (1 - t)
+    omt = 1 - t
+    return (y_r * t**3 + (r * y_r - h * d_r) * t**2 * omt + (r * y_l + h * d_l) * t * omt**2
+            + y_l * omt**3) / (1 + (r - 3) * t * omt)
+
+
+def _minimum_rational_cubic_control_parameter(d_l, d_r, s, prefer_shape_preservation):
+    monotonic = d_l * s >= 0 and d_r * s >= 0
+    convex = d_l <= s <= d_r
+    concave = d_l >= s >= d_r
+    if not (monotonic or convex or concave):
+        return _MINIMUM_RATIONAL_CUBIC_CONTROL_PARAMETER
+    r1 = r2 = -_DBL_MAX
+    if monotonic:
+        if s != 0:
+            r1 = (d_r + d_l) / s
+        elif prefer_shape_preservation:
+            r1 = _MAXIMUM_RATIONAL_CUBIC_CONTROL_PARAMETER
+    if convex or concave:
+        if s - d_l != 0 and d_r - s != 0:
+            r2 = max(abs((d_r - d_l) / (d_r - s)), abs((d_r - d_l) / (s - d_l)))
+        elif prefer_shape_preservation:
+            r2 = _MAXIMUM_RATIONAL_CUBIC_CONTROL_PARAMETER
+    elif monotonic and prefer_shape_preservation:
+        r2 = _MAXIMUM_RATIONAL_CUBIC_CONTROL_PARAMETER
+    return max(_MINIMUM_RATIONAL_CUBIC_CONTROL_PARAMETER, r1, r2)
+
+
+def _convex_rational_cubic_control_parameter(x_l, x_r, y_l, y_r, d_l, d_r, second_derivative,
+                                             left_side, prefer_shape_preservation):
+    # Control parameter that matches the given second derivative at the left or right
+    # end of the interval, floored so that the interpolant stays convex and monotonic.
+    h = x_r - x_l
+    numerator = 0.5 * h * second_derivative + (d_r - d_l)
+    denominator = (y_r - y_l) / h - d_l if left_side else d_r - (y_r - y_l) / h
+    if numerator == 0:
+        r = 0.0
+    elif denominator == 0:
+        r = _MAXIMUM_RATIONAL_CUBIC_CONTROL_PARAMETER if numerator > 0 \
+            else _MINIMUM_RATIONAL_CUBIC_CONTROL_PARAMETER
+    else:
+        r = numerator / denominator
+    r_min = _minimum_rational_cubic_control_parameter(
+        d_l, d_r, (y_r - y_l) / h, prefer_shape_preservation)
+    return max(r, r_min)
+
+
+def _f_lower_map_and_derivatives(x, s):
+    ax = abs(x)
+    z = _SQRT_ONE_OVER_THREE * ax / s
+    y = z * z
+    s2 = s * s
+    Phi = norm_cdf(-z)
+    phi = norm_pdf(z)
+    fpp = _PI_OVER_SIX * y / (s2 * s) * Phi * (
+        8 * _SQRT_THREE * s * ax + (3 * s2 * (s2 - 8) - 8 * x * x) * Phi / phi) * exp(2 * y + 0.25 * s2)
+    Phi2 = Phi * Phi
+    fp = 2 * pi * y * Phi2 * exp(y + 0.125 * s2)
+    f = _TWO_PI_OVER_SQRT_TWENTY_SEVEN * ax * Phi2 * Phi
+    return f, fp, fpp
+
+
+def _inverse_f_lower_map(x, f):
+    if f <= 0:
+        return 0.0
+    return abs(x / (_SQRT_THREE * norm_ppf((f / (_TWO_PI_OVER_SQRT_TWENTY_SEVEN * abs(x))) ** (1 / 3))))
+
+
+def _f_upper_map_and_derivatives(x, s):
+    f = norm_cdf(-0.5 * s)
+    w = (x / s) ** 2
+    fp = -0.5 * exp(0.5 * w)
+    fpp = _SQRT_PI_OVER_TWO * exp(w + 0.125 * s * s) * w / s
+    return f, fp, fpp
+
+
+def _inverse_f_upper_map(f):
+    return -2 * norm_ppf(f)
+
+
+def _lets_be_rational(beta, x):
+    """
+        Normalised implied volatility of an out-of-the-money call (x <= 0) with
+        normalised price 0 < beta < exp(x/2), following Jaeckel's "Let's Be Rational".
+
+        The rational cubic initial guess of the matching branch is refined with exactly
+        _IMPLIED_VOL_ITERATIONS Householder(3) steps on the objective of that branch.
+    """
+
+    if x == 0:
+        # The at-the-money price inverts in closed form
+        return -2 * norm_ppf((1 - beta) / 2)
+
+    b_max = exp(0.5 * x)
+    s_c = sqrt(abs(2 * x))
+    b_c = _normalised_black_call(x, s_c)
+    v_c = _normalised_vega(x, s_c)
+
+    if beta < b_c:
+        s_l = s_c - b_c / v_c
+        b_l = _normalised_black_call(x, s_l)
+        if beta < b_l:
+            # Lowest branch, interpolating in the transformed space of the lower map and
+            # iterating on g(s) = 1/ln(b(s)) - 1/ln(beta)
+            f_l, fp_l, fpp_l = _f_lower_map_and_derivatives(x, s_l)
+            r_ll = _convex_rational_cubic_control_parameter(
+                0., b_l, 0., f_l, 1., fp_l, fpp_l, False, True)
+            f = _rational_cubic_interpolation(beta, 0., b_l, 0., f_l, 1., fp_l, r_ll)
+            if not f > 0:
+                t = beta / b_l
+                f = (f_l * t + b_l * (1 - t)) * t
+            s = _inverse_f_lower_map(x, f)
+            ln_beta = log(beta)
+            for _ in range(_IMPLIED_VOL_ITERATIONS):
+                b = _normalised_black_call(x, s)
+                bp = _normalised_vega(x, s)
+                if b <= 0 or bp <= 0:
+                    break
+                ln_b = log(b)
+                bpob = bp / b
+                h = x / s
+                b_halley = h * h / s - s / 4
+                newton = (ln_beta - ln_b) * ln_b / ln_beta / bpob
+                halley = b_halley - bpob * (1 + 2 / ln_b)
+                b_hh3 = b_halley * b_halley - 3 * (h / s) ** 2 - 0.25
+                hh3 = b_hh3 + 2 * bpob ** 2 * (1 + 3 / ln_b * (1 + 1 / ln_b)) \
+                    - 3 * b_halley * bpob * (1 + 2 / ln_b)
+                s += max(-0.5 * s, newton * _householder_factor(newton, halley, hh3))
+            return s
+
+        v_l = _normalised_vega(x, s_l)
+        r_lm = _convex_rational_cubic_control_parameter(
+            b_l, b_c, s_l, s_c, 1 / v_l, 1 / v_c, 0., False, False)
+        s = _rational_cubic_interpolation(beta, b_l, b_c, s_l, s_c, 1 / v_l, 1 / v_c, r_lm)
+    else:
+        s_h = s_c + (b_max - b_c) / v_c if v_c > _DBL_MIN else s_c
+        b_h = _normalised_black_call(x, s_h)
+        if beta <= b_h:
+            v_h = _normalised_vega(x, s_h)
+            r_hm = _convex_rational_cubic_control_parameter(
+                b_c, b_h, s_c, s_h, 1 / v_c, 1 / v_h, 0., True, False)
+            s = _rational_cubic_interpolation(beta, b_c, b_h, s_c, s_h, 1 / v_c, 1 / v_h, r_hm)
+        else:
+            # Highest branch, interpolating in the transformed space of the upper map
+            f_h, fp_h, fpp_h = _f_upper_map_and_derivatives(x, s_h)
+            f = -1.0
+            if -_SQRT_DBL_MAX < fpp_h < _SQRT_DBL_MAX:
+                r_hh = _convex_rational_cubic_control_parameter(
+                    b_h, b_max, f_h, 0., fp_h, -0.5, fpp_h, True, True)
+                f = _rational_cubic_interpolation(beta, b_h, b_max, f_h, 0., fp_h, -0.5, r_hh)
+            if f <= 0:
+                h = b_max - b_h
+                t = (beta - b_h) / h
+                f = (f_h * (1 - t) + 0.5 * h * t) * (1 - t)
+            s = _inverse_f_upper_map(f)
+            if beta > 0.5 * b_max:
+                # Iterate on g(s) = ln(b_max - beta) - ln(b_max - b(s))
+                for _ in range(_IMPLIED_VOL_ITERATIONS):
+                    b = _normalised_black_call(x, s)
+                    bp = _normalised_vega(x, s)
+                    if b >= b_max or bp <= _DBL_MIN:
+                        break
+                    b_max_minus_b = b_max - b
+                    g = log((b_max - beta) / b_max_minus_b)
+                    gp = bp / b_max_minus_b
+                    b_halley = (x / s) ** 2 / s - s / 4
+                    b_hh3 = b_halley * b_halley - 3 * (x / (s * s)) ** 2 - 0.25
+                    newton = -g / gp
+                    halley = b_halley + gp
+                    hh3 = b_hh3 + gp * (2 * gp + 3 * b_halley)
+                    s += max(-0.5 * s, newton * _householder_factor(newton, halley, hh3))
+                return s
+
+    # Middle branches, iterating on g(s) = b(s) - beta
+    for _ in range(_IMPLIED_VOL_ITERATIONS):
+        b = _normalised_black_call(x, s)
+        bp = _normalised_vega(x, s)
+        if bp <= _DBL_MIN:
+            break
+        newton = (beta - b) / bp
+        halley = (x / s) ** 2 / s - s / 4
+        hh3 = halley * halley - 3 * (x / (s * s)) ** 2 - 0.25
+        s += max(-0.5 * s, newton * _householder_factor(newton, halley, hh3))
+    return s
+
+
+def implied_vol(price, spot, strike, expiry, rate, type="call"):
+    """
+        Computes the Black-Scholes implied volatility using Jaeckel's "Let's Be Rational"
+        algorithm (http://www.jaeckel.org/LetsBeRational.pdf).
+
+        Puts and in-the-money options are mapped onto out-of-the-money calls, a rational
+        cubic initial guess is taken from one of four branches, and the guess is refined
+        with two Householder(3) iterations. The amount of work per price is therefore
+        fixed.
 
         Parameters
         ----------
@@ -364,11 +957,13 @@ def implied_vol(price, spot, strike, expiry, rate):
         spot: float
             The spot price of the underlying.
         strike: float
-            The strike price of the call.
+            The strike price of the option.
         expiry: float
             The time to expiration.
         rate: float
             The risk free interest rate to use in the model (as a percentage).
+        type: string
+            Either "call" or "put".
 
         Returns
         -------
@@ -376,62 +971,144 @@ def implied_vol(price, spot, strike, expiry, rate):
             The Black-Scholes implied volatility corresponding to the entered price.
     """
 
-
     rate /= 100
-    tolerance = 0.00000001
+    theta = 1 if type == "call" else -1
 
-    theta = 1
+    x = theta * log(exp(rate*expiry)*spot/strike)
+    scaled_price = price * exp(rate*expiry/2) / sqrt(spot*strike)
+    intrinsic = max(exp(x/2) - exp(-x/2), 0)
 
-    if spot - exp(-rate * expiry) * strike >= price or price >= spot:
+    if scaled_price <= intrinsic or scaled_price >= exp(x/2):
         print("Option price out of range")
         return
-    
 
-    x=log(exp(rate*expiry)*spot/strike)
-    scaled_price = price * exp(rate*expiry/2) / sqrt(spot*strike)
-
-    def F(sigma):
-        return theta * exp(x/2) * norm.cdf(theta*(x/sigma + sigma/2)) \
-            - theta * exp(-x/2) * norm.cdf(theta*(x/sigma - sigma/2))
-    
-    def Fprime(sigma):
-        return exp(x/2)*norm.pdf(theta*(x/sigma + sigma/2)) * (-x/sigma**2 + 0.5) \
-            - exp(-x/2) * norm.pdf(theta * (x/sigma - sigma/2)) * (-x/sigma**2 - 0.5)
+    sigma = _lets_be_rational(scaled_price - intrinsic, -abs(x))
+    return 100*sigma/sqrt(expiry)
 
-    sigma_c = sqrt(2 * abs(x))
 
-    b_c = F(sigma_c)
+IV_CONVERGED = 0
+IV_PRICE_OUT_OF_RANGE = 1
+IV_INVALID_INPUT = 2
+IV_NOT_CONVERGED = 3
 
-    if scaled_price >= b_c:
-        pval = (exp(theta*x/2)-scaled_price) * norm.cdf(-sqrt(abs(x)/2))/(exp(theta*x/2)-b_c)
-        old_sigma = -2 * norm.ppf(pval)
-        new_sigma = old_sigma - (F(old_sigma) - scaled_price)/Fprime(old_sigma)
 
-        while abs(new_sigma - old_sigma) > tolerance:
-            old_sigma = new_sigma
-            new_sigma = old_sigma - (F(old_sigma) - scaled_price)/Fprime(old_sigma)
+def implied_vol_batch(price, spot, strike, expiry, rate, type="call", tolerance=1e-8,
+                      max_iterations=100):
+    """
+        Vectorized version of implied_vol for whole arrays of call and put prices.
 
-        return 100*new_sigma/sqrt(expiry)
-    else:
-        if theta * x <= 0:
-            iota = 0
-        else:
-            iota = theta * (exp(x/2) - exp(-x/2))
-        
-        def G(sigma):
-            return log(F(sigma) - iota) - log(scaled_price - iota)
-        
-        def Gprime(sigma):
-            return Fprime(sigma)/(F(sigma) - iota)
+        Puts are mapped onto calls through b_put(x, sigma) = b_call(-x, sigma) in the
+        normalised price space, and in-the-money options onto out-of-the-money ones by
+        subtracting the intrinsic value. The initial guess of Jaeckel's algorithm and the Newton
+        iterations then run in lockstep over the array, with lanes that have converged
+        masked out of further iterations.
 
-        old_sigma = sqrt(2*x**2/(abs(x)-4 * log((scaled_price - iota)/(b_c - iota))))
-        new_sigma = old_sigma - G(old_sigma)/Gprime(old_sigma)
+        Parameters
+        ----------
+        price: float or array_like
+            The option prices.
+        spot: float or array_like
+            The spot price of the underlying.
+        strike: float or array_like
+            The strike prices of the options.
+        expiry: float or array_like
+            The times to expiration.
+        rate: float or array_like
+            The risk free interest rate to use in the model (as a percentage).
+        type: string or array_like
+            Either "call" or "put", or an array of them broadcastable against the prices.
+        tolerance: float
+            The Newton iterations of a lane stop once its step is below this value.
+        max_iterations: int
+            The maximum number of Newton iterations.
 
-        while abs(new_sigma - old_sigma) > tolerance:
-            old_sigma = new_sigma
-            new_sigma = old_sigma - G(old_sigma)/Gprime(old_sigma)
+        Returns
+        -------
+        tuple of ndarray
+            The implied volatilities (as a percentage), NaN where no volatility was
+            found, and the status of every lane, one of IV_CONVERGED,
+            IV_PRICE_OUT_OF_RANGE, IV_INVALID_INPUT or IV_NOT_CONVERGED.
+    """
 
-        return 100*new_sigma/sqrt(expiry)
+    price, spot, strike, expiry, rate, type = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (price, spot, strike, expiry, rate)), np.asarray(type))
+    rate = rate / 100
+    theta = np.where(type == "call", 1.0, -1.0)
+
+    vols = np.full(price.shape, np.nan)
+    status = np.full(price.shape, IV_NOT_CONVERGED)
+
+    valid = (spot > 0) & (strike > 0) & (expiry > 0) & np.isfinite(price) & np.isfinite(rate) \
+        & ((type == "call") | (type == "put"))
+    status[~valid] = IV_INVALID_INPUT
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        x = np.where(valid, theta * np.log(np.exp(rate*expiry)*spot/strike), 0.0)
+        scaled_price = price * np.exp(rate*expiry/2) / np.sqrt(spot*strike)
+        intrinsic = np.maximum(np.exp(x/2) - np.exp(-x/2), 0.0)
+        in_range = (scaled_price > intrinsic) & (scaled_price < np.exp(x/2))
+        status[valid & ~in_range] = IV_PRICE_OUT_OF_RANGE
+        lanes = np.flatnonzero(valid & in_range)
+
+        # In-the-money lanes are replaced by their out-of-the-money counterpart, so
+        # every lane solves for a call with x <= 0 and no intrinsic value.
+        x = x.ravel()[lanes]
+        scaled_price = scaled_price.ravel()[lanes] - intrinsic.ravel()[lanes]
+        x = -np.abs(x)
+
+        def F(x, sigma):
+            return np.exp(x/2) * norm_cdf(x/sigma + sigma/2) - np.exp(-x/2) * norm_cdf(x/sigma - sigma/2)
+
+        def Fprime(x, sigma):
+            return np.exp(x/2) * norm_pdf(x/sigma + sigma/2) * (-x/sigma**2 + 0.5) \
+                - np.exp(-x/2) * norm_pdf(x/sigma - sigma/2) * (-x/sigma**2 - 0.5)
+
+        sigma_c = np.sqrt(2 * np.abs(x))
+        b_c = np.where(x == 0, 0.0, F(x, sigma_c))
+        upper = scaled_price >= b_c
+
+        pval = (np.exp(x/2) - scaled_price) * norm_cdf(-np.sqrt(np.abs(x)/2)) / (np.exp(x/2) - b_c)
+        sigma = np.where(
+            upper,
+            -2 * norm_ppf(pval),
+            np.sqrt(2*x**2/(np.abs(x) - 4*np.log(scaled_price/b_c))))
+
+        active = np.arange(lanes.size)
+        for _ in range(max_iterations):
+            if active.size == 0:
+                break
+            s = sigma[active]
+            a_x = x[active]
+            a_price = scaled_price[active]
+            f = F(a_x, s)
+            fprime = Fprime(a_x, s)
+            step = np.where(
+                upper[active],
+                (f - a_price) / fprime,
+                (np.log(f) - np.log(a_price)) * f / fprime)
+            new_sigma = np.maximum(s - step, s / 2)
+            sigma[active] = new_sigma
+            active = active[np.abs(new_sigma - s) > tolerance]
+
+        converged = np.ones(lanes.size, dtype=bool)
+        converged[active] = False
+        converged &= np.isfinite(sigma)
+
+    flat_vols = vols.reshape(-1)
+    flat_status = status.reshape(-1)
+    flat_vols[lanes[converged]] = 100 * sigma[converged] / np.sqrt(expiry.ravel()[lanes[converged]])
+    flat_status[lanes[converged]] = IV_CONVERGED
+    return vols, status
+
+
+# (call, put) array kernels behind option.profile, rho and the payoff are handled there
+_PROFILE_KERNELS = {
+    "price": (BSCall_Array, BSPut_Array),
+    "delta": (BSCall_Delta_Array, BSPut_Delta_Array),
+    "gamma": (BSCall_Gamma_Array, BSPut_Gamma_Array),
+    "vega": (BSCall_Vega_Array, BSPut_Vega_Array),
+    "theta": (BSCall_Theta_Array, BSPut_Theta_Array),
+}
 
 
 class option:
@@ -690,44 +1367,116 @@ class option:
             return BSPut_Theta(spot, time, self.strike, self.expiry, vol, rate)
     
 
-    def plot_payoff(self):
+    def risk(self, spot, time, vol, rate):
         """
-        Plots the payoff (at expiration) of the option.
+        Returns the option price and all of its Greeks from one shared evaluation.
 
         Parameters
         ----------
-        None
+        spot: float
+            The spot price of the underlying.
+        time: float
+            The date the option should be priced for.
+        vol: float
+            The implied volatility to use for pricing.
+        rate: float
+            The risk free interest rate to use (as a percantage).
 
         Returns
         -------
-        None
+        dict
+            The option price, delta, gamma, vega, theta and rho.
+        """
+        if time > self.expiry:
+            print("Evaluation time must precede expiry")
+            return None
+
+        risk = BS_Risk_Array(spot, time, self.strike, self.expiry, vol, rate, self.type)
+        return {key: value[()] for key, value in risk.items()}
+
+
+    def profile(self, quantity, spots, time=0.0, vol=None, rate=None):
         """
+        Evaluates the payoff, price or one of the Greeks of the option over a whole grid
+        of spot prices in a single vectorized call.
+
+        Parameters
+        ----------
+        quantity: string
+            One of "payoff", "price", "delta", "gamma", "vega", "theta" or "rho".
+        spots: array_like
+            The spot prices of the underlying.
+        time: float
+            The date the option should be priced for (ignored for the payoff).
+        vol: float
+            The implied volatility to use for pricing (required except for the payoff).
+        rate: float
+            The risk free interest rate to use (as a percantage, required except for the
+            payoff).
+
+        Returns
+        -------
+        ndarray
+            The requested quantity for every spot price.
+        """
+        spots = np.asarray(spots, dtype=float)
+
+        if quantity == "payoff":
+            if self.type == "call":
+                return np.maximum(spots - self.strike, 0.0)
+            return np.maximum(self.strike - spots, 0.0)
+
+        if quantity != "rho" and quantity not in _PROFILE_KERNELS:
+            print("Unknown profile quantity: " + str(quantity))
+            return None
+
+        if vol is None or rate is None:
+            print("Must provide a vol and a rate")
+            return None
+
+        if time > self.expiry:
+            print("Evaluation time must precede expiry")
+            return None
+
+        if quantity == "rho":
+            return BS_Risk_Array(spots, time, self.strike, self.expiry, vol, rate, self.type)["rho"]
+
+        call_kernel, put_kernel = _PROFILE_KERNELS[quantity]
+        kernel = call_kernel if self.type == "call" else put_kernel
+        return kernel(spots, time, self.strike, self.expiry, vol, rate)
+
+    def _plot_profile(self, quantity, spots, title, time=0.0, vol=None, rate=None):
         if not HASMATPLOTLIB:
             print("Plotting functions require Matplotlib")
             return None
-        
+
+        values = self.profile(quantity, spots, time, vol, rate)
+        if values is None:
+            return None
+
+        plt = _import_pyplot()
         fig, ax = plt.subplots()
 
+        ax.plot(spots, values)
 
-        s=np.arange(0.0, 2*self.strike, 0.1)
+        ax.set(xlabel='spot', ylabel=quantity,
+            title = title)
 
-        p=[]
-        for spot in s:
-            if self.type == "call":
-                price = max(0, spot - self.strike)
-            else:
-                price = max(0, self.strike - spot)
+        plt.show(block=False)
 
-            p.append(price)
-        
-        payoff = np.array(p)
+    def plot_payoff(self):
+        """
+        Plots the payoff (at expiration) of the option.
 
-        ax.plot(s, payoff)
+        Parameters
+        ----------
+        None
 
-        ax.set(xlabel='spot', ylabel='payoff',
-            title = 'Option Payoff')
-        
-        plt.show(block=False)
+        Returns
+        -------
+        None
+        """
+        self._plot_profile("payoff", np.arange(0.0, 2*self.strike, 0.1), 'Option Payoff')
 
 
     def plot_price(self, time, vol, rate):
@@ -747,36 +1496,8 @@ class option:
         -------
         None
         """
-        if not HASMATPLOTLIB:
-            print("Plotting functions require Matplotlib")
-            return None
-        
-        if time > self.expiry:
-            print("Evaluation time must precede expiry")
-            return None
-        
-        fig, ax = plt.subplots()
-
-
-        s=np.arange(0.1, 2*self.strike, 0.1)
-
-        p=[]
-        for spot in s:
-            if self.type == "call":
-                price = BSCall(spot, time, self.strike, self.expiry, vol, rate)
-            else:
-                price = BSPut(spot, time, self.strike, self.expiry, vol, rate)
-
-            p.append(price)
-        
-        prices = np.array(p)
-
-        ax.plot(s, prices)
-
-        ax.set(xlabel='spot', ylabel='price',
-            title = 'Option Price vs. Spot Price')
-        
-        plt.show(block=False)
+        self._plot_profile("price", np.arange(0.1, 2*self.strike, 0.1),
+            'Option Price vs. Spot Price', time, vol, rate)
     
     
     def plot_delta(self, time, vol, rate):
@@ -796,36 +1517,8 @@ class option:
         -------
         None
         """
-        if not HASMATPLOTLIB:
-            print("Plotting functions require Matplotlib")
-            return None
-        
-        if time > self.expiry:
-            print("Evaluation time must precede expiry")
-            return None
-        
-        fig, ax = plt.subplots()
-
-
-        s=np.arange(0.1, 2*self.strike, 0.1)
-
-        d=[]
-        for spot in s:
-            if self.type == "call":
-                delta = BSCall_Delta(spot, time, self.strike, self.expiry, vol, rate)
-            else:
-                delta = BSPut_Delta(spot, time, self.strike, self.expiry, vol, rate)
-
-            d.append(delta)
-        
-        deltas = np.array(d)
-
-        ax.plot(s, deltas)
-
-        ax.set(xlabel='spot', ylabel='delta',
-            title = 'Option Delta vs. Spot Price')
-        
-        plt.show(block=False)
+        self._plot_profile("delta", np.arange(0.1, 2*self.strike, 0.1),
+            'Option Delta vs. Spot Price', time, vol, rate)
     
     def plot_gamma(self, time, vol, rate):
         """
@@ -844,36 +1537,8 @@ class option:
         -------
         None
         """
-        if not HASMATPLOTLIB:
-            print("Plotting functions require Matplotlib")
-            return None
-        
-        if time > self.expiry:
-            print("Evaluation time must precede expiry")
-            return None
-        
-        fig, ax = plt.subplots()
-
-
-        s=np.arange(0.1, 2*self.strike, 0.1)
-
-        g=[]
-        for spot in s:
-            if self.type == "call":
-                gamma = BSCall_Gamma(spot, time, self.strike, self.expiry, vol, rate)
-            else:
-                gamma = BSPut_Gamma(spot, time, self.strike, self.expiry, vol, rate)
-
-            g.append(gamma)
-        
-        gammas = np.array(g)
-
-        ax.plot(s, gammas)
-
-        ax.set(xlabel='spot', ylabel='gamma',
-            title = 'Option Gamma vs. Spot Price')
-        
-        plt.show(block=False)
+        self._plot_profile("gamma", np.arange(0.1, 2*self.strike, 0.1),
+            'Option Gamma vs. Spot Price', time, vol, rate)
 
     
     def plot_vega(self, time, vol, rate):
@@ -893,36 +1558,8 @@ class option:
         -------
         None
         """
-        if not HASMATPLOTLIB:
-            print("Plotting functions require Matplotlib")
-            return None
-        
-        if time > self.expiry:
-            print("Evaluation time must precede expiry")
-            return None
-        
-        fig, ax = plt.subplots()
-
-
-        s=np.arange(0.1, 2*self.strike, 0.1)
-
-        v=[]
-        for spot in s:
-            if self.type == "call":
-                vega = BSCall_Vega(spot, time, self.strike, self.expiry, vol, rate)
-            else:
-                vega = BSPut_Vega(spot, time, self.strike, self.expiry, vol, rate)
-
-            v.append(vega)
-        
-        vegas = np.array(v)
-
-        ax.plot(s, vegas)
-
-        ax.set(xlabel='spot', ylabel='vega',
-            title = 'Option Vega vs. Spot Price')
-        
-        plt.show(block=False)
+        self._plot_profile("vega", np.arange(0.1, 2*self.strike, 0.1),
+            'Option Vega vs. Spot Price', time, vol, rate)
 
     
     def plot_theta(self, time, vol, rate):
@@ -942,37 +1579,170 @@ class option:
         -------
         None
         """
-        if not HASMATPLOTLIB:
-            print("Plotting functions require Matplotlib")
-            return None
-        
-        if time > self.expiry:
-            print("Evaluation time must precede expiry")
+        self._plot_profile("theta", np.arange(0.1, 2*self.strike, 0.1),
+            'Option Theta vs. Spot Price', time, vol, rate)
+
+
+class option_book:
+    """
+    Book of option positions stored column-wise in contiguous NumPy arrays, so that the
+    whole book is priced and risked in one vectorized pass.
+
+    Attributes
+    ----------
+    strikes: ndarray
+        The strike prices of the positions.
+    expiries: ndarray
+        The expiration dates of the positions, in years.
+    types: ndarray
+        Either "call" or "put" for every position.
+    quantities: ndarray
+        The signed number of contracts held in every position.
+    underlyings: ndarray
+        The name of the underlying of every position.
+    """
+
+
+    def __init__(self):
+        self.strikes = np.empty(0)
+        self.expiries = np.empty(0)
+        self.types = np.empty(0, dtype="<U4")
+        self.quantities = np.empty(0)
+        self.underlyings = np.empty(0, dtype=str)
+
+    def __len__(self):
+        return self.strikes.size
+
+    def add(self, strikes, expiries, types="call", quantities=1.0, underlyings=""):
+        """
+        Appends positions to the book. All arguments are broadcast against each other.
+
+        Parameters
+        ----------
+        strikes: float or array_like
+            The strike prices.
+        expiries: float or array_like
+            The expiration dates (in years).
+        types: string or array_like
+            Either "call" or "put".
+        quantities: float or array_like
+            The signed number of contracts.
+        underlyings: string or array_like
+            The names of the underlyings.
+
+        Returns
+        -------
+        ndarray
+            The indices of the new positions in the book, or None if a type is invalid.
+        """
+        types = np.asarray(types, dtype=str)
+        if not np.all((types == "call") | (types == "put")):
+            print("Option type must be call or put")
             return None
-        
-        fig, ax = plt.subplots()
 
+        strikes, expiries, types, quantities, underlyings = np.broadcast_arrays(
+            np.asarray(strikes, dtype=float), np.asarray(expiries, dtype=float),
+            types.astype("<U4"), np.asarray(quantities, dtype=float),
+            np.asarray(underlyings, dtype=str))
 
-        s=np.arange(0.1, 2*self.strike, 0.1)
+        start = len(self)
+        self.strikes = np.concatenate((self.strikes, strikes.ravel()))
+        self.expiries = np.concatenate((self.expiries, expiries.ravel()))
+        self.types = np.concatenate((self.types, types.ravel()))
+        self.quantities = np.concatenate((self.quantities, quantities.ravel()))
+        self.underlyings = np.concatenate((self.underlyings, underlyings.ravel()))
+        return np.arange(start, len(self))
 
-        t=[]
-        for spot in s:
-            if self.type == "call":
-                theta = BSCall_Theta(spot, time, self.strike, self.expiry, vol, rate)
-            else:
-                theta = BSPut_Theta(spot, time, self.strike, self.expiry, vol, rate)
+    def add_option(self, option, quantity=1.0, underlying=""):
+        """
+        Appends a single option object to the book.
 
-            t.append(theta)
-        
-        thetas = np.array(t)
+        Parameters
+        ----------
+        option: option
+            The option to add.
+        quantity: float
+            The signed number of contracts.
+        underlying: string
+            The name of the underlying.
 
-        ax.plot(s, thetas)
+        Returns
+        -------
+        ndarray
+            The index of the new position in the book.
+        """
+        return self.add(option.get_strike(), option.get_expiry(), option.get_type(), quantity, underlying)
 
-        ax.set(xlabel='spot', ylabel='theta',
-            title = 'Option Theta vs. Spot Price')
-        
-        plt.show(block=False)
+    def remove(self, positions):
+        """
+        Removes positions from the book.
+
+        Parameters
+        ----------
+        positions: array_like
+            Either the indices of the positions or a boolean mask over the book.
 
+        Returns
+        -------
+        None
+        """
+        positions = np.asarray(positions)
+        if positions.dtype != bool:
+            # also makes an empty list a valid (empty) index
+            positions = positions.astype(np.intp)
+        keep = np.ones(len(self), dtype=bool)
+        keep[positions] = False
+
+        self.strikes = self.strikes[keep]
+        self.expiries = self.expiries[keep]
+        self.types = self.types[keep]
+        self.quantities = self.quantities[keep]
+        self.underlyings = self.underlyings[keep]
+
+    def _per_position(self, values, inverse, names):
+        # Expands a scalar, a per position array or a dict keyed by underlying
+        if isinstance(values, dict):
+            return np.array([values[name] for name in names], dtype=float)[inverse]
+        return np.broadcast_to(np.asarray(values, dtype=float), (len(self),))
+
+    def risk(self, spot, time, vol, rate):
+        """
+        Returns the position-weighted price and Greeks of the book, in total and per
+        underlying. Positions that expire before the evaluation time are left out.
 
+        Parameters
+        ----------
+        spot: float, array_like or dict
+            The spot price, either shared, per position, or keyed by underlying.
+        time: float
+            The date the book should be priced for.
+        vol: float, array_like or dict
+            The implied volatility (as a percentage), either shared, per position, or
+            keyed by underlying.
+        rate: float
+            The risk free interest rate to use (as a percantage).
 
-    
+        Returns
+        -------
+        tuple of dict
+            The totals of "price", "delta", "gamma", "vega", "theta" and "rho" over the
+            book, and a dict mapping every underlying to the same totals over its
+            positions.
+        """
+        names, inverse = np.unique(self.underlyings, return_inverse=True)
+        spot = self._per_position(spot, inverse, names)
+        vol = self._per_position(vol, inverse, names)
+
+        live = self.expiries > time
+        risk = BS_Risk_Array(spot[live], time, self.strikes[live], self.expiries[live],
+                             vol[live], rate, self.types[live])
+
+        totals = dict()
+        by_underlying = {name: dict() for name in names}
+        for key, value in risk.items():
+            weighted = self.quantities[live] * value
+            totals[key] = weighted.sum()
+            for name, total in zip(names, np.bincount(inverse[live], weights=weighted, minlength=names.size)):
+                by_underlying[name][key] = total
+
+        return totals, by_underlying
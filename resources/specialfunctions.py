@@ -0,0 +1,121 @@
+"""Standard normal distribution functions used by the option pricers"""
+
+from math import erfc, exp, inf, nan, pi, sqrt
+from statistics import NormalDist
+
+import numpy as np
+
+
+_ONE_OVER_SQRT_TWO = 1 / sqrt(2)
+_ONE_OVER_SQRT_TWO_PI = 1 / sqrt(2 * pi)
+_STANDARD_NORMAL = NormalDist()
+
+
+class math_backend:
+    """
+    Default backend. Python scalars are evaluated with the math module, which avoids the
+    per-call overhead of scipy.stats, and arrays are evaluated with the scipy.special
+    ufuncs ndtr and ndtri. scipy is only imported once an array is evaluated.
+    """
+
+    def cdf(self, x):
+        if isinstance(x, (int, float)):
+            return 0.5 * erfc(-x * _ONE_OVER_SQRT_TWO)
+        from scipy.special import ndtr
+        return ndtr(x)
+
+    def pdf(self, x):
+        if isinstance(x, (int, float)):
+            return _ONE_OVER_SQRT_TWO_PI * exp(-0.5 * x * x)
+        return _ONE_OVER_SQRT_TWO_PI * np.exp(-0.5 * np.square(x))
+
+    def ppf(self, p):
+        if isinstance(p, (int, float)):
+            if 0 < p < 1:
+                return _STANDARD_NORMAL.inv_cdf(p)
+            if p == 0:
+                return -inf
+            if p == 1:
+                return inf
+            return nan
+        from scipy.special import ndtri
+        return ndtri(p)
+
+
+class scipy_stats_backend:
+    """
+    Backend that delegates to scipy.stats.norm for both scalars and arrays.
+    """
+
+    def __init__(self):
+        from scipy.stats import norm
+        self._norm = norm
+
+    def cdf(self, x):
+        return self._norm.cdf(x)
+
+    def pdf(self, x):
+        return self._norm.pdf(x)
+
+    def ppf(self, p):
+        return self._norm.ppf(p)
+
+
+_BACKENDS = {
+    "math": math_backend,
+    "scipy": scipy_stats_backend,
+}
+
+_backend = math_backend()
+
+
+def set_backend(backend):
+    """
+    Selects the backend used by norm_cdf, norm_pdf and norm_ppf.
+
+    Parameters
+    ----------
+    backend: string or object
+        Either the name of a registered backend ("math" or "scipy") or an object
+        providing cdf, pdf and ppf methods.
+
+    Returns
+    -------
+    None
+    """
+    global _backend
+
+    if isinstance(backend, str):
+        if backend not in _BACKENDS:
+            raise ValueError("Unknown backend: {}".format(backend))
+        backend = _BACKENDS[backend]()
+    _backend = backend
+
+
+def get_backend():
+    """
+    Returns the backend currently used by norm_cdf, norm_pdf and norm_ppf.
+    """
+    return _backend
+
+
+def norm_cdf(x):
+    """
+    Standard normal cumulative distribution function of a scalar or an array.
+    """
+    return _backend.cdf(x)
+
+
+def norm_pdf(x):
+    """
+    Standard normal probability density function of a scalar or an array.
+    """
+    return _backend.pdf(x)
+
+
+def norm_ppf(p):
+    """
+    Inverse of the standard normal cumulative distribution function of a scalar or an
+    array.
+    """
+    return _backend.ppf(p)